@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+# Serve lms_project.asgi:application with uvicorn workers, so async views
+# can wait on Razorpay and the database without holding the whole worker.
+# Set GUNICORN_WORKER_CLASS=sync (or gthread) to go back to WSGI: the app
+# follows the worker class unless GUNICORN_APP names one. The start command
+# must not pass an app path, or it wins over this one.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+wsgi_app = os.getenv(
+    "GUNICORN_APP",
+    "lms_project.asgi:application" if "uvicorn" in worker_class.lower() else "lms_project.wsgi:application",
+)
+
+
+def post_worker_init(worker):
+    """
+    Open this worker's database pool before it takes traffic, so the first
+    request doesn't pay for the TLS handshake. Runs after the fork: a pool
+    must never be shared between processes.
+    """
+    from django.db import connection
+
+    try:
+        connection.ensure_connection()
+    except Exception:
+        worker.log.exception("Database warm-up failed; connecting on first request instead")
+    finally:
+        # With a pool this hands the connection back instead of closing it
+        connection.close()
@@ -0,0 +1,83 @@
+# lms/access.py
+from django.db.models import Exists, OuterRef
+
+
+class CourseAccess:
+    """
+    Resolve what a user can open inside one course.
+
+    The purchase / enrollment state is loaded once (a single query) the first
+    time a paid video is checked, after that every Video / CurriculumDay of
+    the course is answered from memory.
+
+    Access rules:
+    - Free videos and free curriculum days are open to everyone
+    - Day 1 is free for all users
+    - Day 2+ requires a completed purchase
+    """
+
+    def __init__(self, user, course):
+        self.user = user
+        self.course = course
+        self._loaded = False
+        self._has_paid = False
+        self._is_enrolled = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.user.is_authenticated:
+            return
+
+        from .models import Course, Purchase, CourseEnrollment
+
+        state = Course.objects.filter(pk=self.course.pk).annotate(
+            has_paid=Exists(
+                Purchase.objects.filter(
+                    user=self.user,
+                    course=OuterRef('pk'),
+                    payment_status='completed'
+                )
+            ),
+            is_enrolled=Exists(
+                CourseEnrollment.objects.filter(
+                    user=self.user,
+                    course=OuterRef('pk')
+                )
+            ),
+        ).values('has_paid', 'is_enrolled').first()
+
+        if state:
+            self._has_paid = state['has_paid']
+            self._is_enrolled = state['is_enrolled']
+
+    @property
+    def has_paid(self):
+        """True if the user has a completed purchase for the course"""
+        self._load()
+        return self._has_paid
+
+    @property
+    def is_enrolled(self):
+        """True if the user has a (legacy) enrollment for the course"""
+        self._load()
+        return self._is_enrolled
+
+    def can_access_day(self, day):
+        """Check if every video of a curriculum day is open to the user"""
+        if day.is_free or day.day_number == 1:
+            return True
+        return self.has_paid
+
+    def can_access_video(self, video, day=None):
+        """
+        Check a single video. Pass the curriculum day when it is already at
+        hand so ``video.curriculum_day`` is not loaded again.
+        """
+        if video.is_free:
+            return True
+        if day is None:
+            day = video.curriculum_day
+        return self.can_access_day(day)
@@ -14,6 +14,8 @@ from .models import (
     Instructor,
     Course,
     CourseTool,
+    Skill,
+    Tool,
     CurriculumDay,
     Video,
     Lesson,
@@ -23,6 +25,8 @@ from .models import (
     Purchase,
     UserVideoProgress,
 )
+from .catalog import annotate_course_counts
+from .search import search_course_ids
 
 
 # ============================
@@ -155,9 +159,14 @@ class CourseCategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     
+    def get_queryset(self, request):
+        # Count courses for every row in the changelist query itself
+        return annotate_course_counts(super().get_queryset(request))
+    
     def course_count(self, obj):
-        return obj.courses.count()
+        return obj.course_total
     course_count.short_description = 'Number of Courses'
+    course_count.admin_order_field = 'course_total'
 
 
 # ============================
@@ -169,6 +178,27 @@ class InstructorAdmin(admin.ModelAdmin):
     search_fields = ['name']
 
 
+# ============================
+# SKILL & TOOL ADMIN
+# ============================
+# Rows are created from Course.skills / Course.tools_learned on save;
+# only the icon is meant to be adjusted here.
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'icon']
+    list_editable = ['icon']
+    search_fields = ['name', 'key']
+    readonly_fields = ['key']
+
+
+@admin.register(Tool)
+class ToolAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'icon']
+    list_editable = ['icon']
+    search_fields = ['name', 'key']
+    readonly_fields = ['key']
+
+
 # ============================
 # COURSE INLINES
 # ============================
@@ -243,7 +273,7 @@ class CourseAdmin(admin.ModelAdmin):
         'is_active',
         'is_featured',
         'created_at',
-        'total_learners',   # New field
+        'learner_count',
         'payment_type',
     )
 
@@ -264,6 +294,12 @@ class CourseAdmin(admin.ModelAdmin):
         'tools_learned',
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the course search index instead of icontains scans
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(id__in=search_course_ids(search_term, active_only=False)), False
+
     list_editable = (
         'is_active',
         'is_featured',
@@ -336,6 +372,9 @@ class CourseAdmin(admin.ModelAdmin):
                 'total_videos',
                 'total_projects',
                 'total_resources',
+                'learner_count',
+                'rating_count',
+                'average_rating',
             )
         }),
 
@@ -366,6 +405,9 @@ class CourseAdmin(admin.ModelAdmin):
         'updated_at',
         'skills_icons_preview',  # NEW
         'tools_icons_preview',   # NEW
+        'learner_count',
+        'rating_count',
+        'average_rating',
     )
 
     # =========================
@@ -403,6 +445,12 @@ class CourseAdmin(admin.ModelAdmin):
     # SIMPLE METHODS WITHOUT format_html ERRORS
     # =========================
     
+    def get_queryset(self, request):
+        # Skills/tools columns read the normalized links
+        return super().get_queryset(request).select_related('category').prefetch_related(
+            'skill_links__skill', 'tool_links__tool'
+        )
+    
     def display_skills_icons(self, obj):
         """Simple text display for skills"""
         skills = obj.get_skills_list()[:3]
@@ -820,9 +868,16 @@ class QuizAttemptAdmin(admin.ModelAdmin):
 
 @admin.register(QuizResponse)
 class QuizResponseAdmin(admin.ModelAdmin):
-    list_display = ['attempt', 'question', 'is_correct']
-    list_filter = ['attempt__quiz']
-    readonly_fields = ['is_correct']
+    list_display = ['attempt', 'question', 'is_correct', 'points_earned']
+    list_filter = ['attempt__quiz', 'graded_correct']
+    list_select_related = ['attempt__user', 'attempt__quiz', 'question']
+    readonly_fields = ['is_correct', 'points_earned']
+    
+    def is_correct(self, obj):
+        # Reads the grading stored at submit time
+        return obj.is_correct()
+    is_correct.boolean = True
+    is_correct.short_description = 'Correct'
 
 @admin.register(CourseProgress)
 class CourseProgressAdmin(admin.ModelAdmin):
@@ -0,0 +1,131 @@
+# lms/catalog.py
+import base64
+from collections import namedtuple
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Course, CourseCategory, Skill
+
+
+FACETS_KEY = "catalog-facets:v2"
+
+# by_skill is a list of (key, name, count), most used skills first
+CatalogFacets = namedtuple('CatalogFacets', ['total', 'by_category', 'by_skill'])
+SkillFacet = namedtuple('SkillFacet', ['key', 'name', 'count'])
+
+
+def annotate_course_counts(queryset):
+    """
+    Annotate categories with their course counts in the same query:
+    ``course_total`` (all courses) and ``active_course_total``.
+    """
+    return queryset.annotate(
+        course_total=Count('courses'),
+        active_course_total=Count('courses', filter=Q(courses__is_active=True)),
+    )
+
+
+def build_catalog_facets():
+    """Count active courses overall, per category slug and per skill (three queries)"""
+    by_category = dict(
+        annotate_course_counts(CourseCategory.objects.all()).values_list('slug', 'active_course_total')
+    )
+    by_skill = [
+        SkillFacet(*row)
+        for row in Skill.objects.annotate(
+            active_course_total=Count('courses', filter=Q(courses__is_active=True))
+        ).filter(active_course_total__gt=0).order_by(
+            '-active_course_total', 'name'
+        ).values_list('key', 'name', 'active_course_total')[:getattr(settings, 'CATALOG_SKILL_FACETS', 20)]
+    ]
+    total = Course.objects.filter(is_active=True).count()
+    return CatalogFacets(total=total, by_category=by_category, by_skill=by_skill)
+
+
+def get_catalog_facets():
+    """Return the cached catalog facet counts, building them on a miss"""
+    facets = cache.get(FACETS_KEY)
+    if facets is None:
+        facets = build_catalog_facets()
+        cache.set(FACETS_KEY, facets, getattr(settings, 'CATALOG_FACETS_CACHE_TIMEOUT', 60 * 60))
+    return facets
+
+
+def forget_catalog_facets():
+    cache.delete(FACETS_KEY)
+
+
+# ============================
+# KEYSET PAGINATION
+# ============================
+CoursePage = namedtuple('CoursePage', ['courses', 'next_cursor'])
+
+
+def encode_cursor(course):
+    """Opaque cursor pointing just past ``course`` in (-created_at, -id) order"""
+    raw = f"{course.created_at.isoformat()}|{course.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) for a cursor; raises ValueError when it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def paginate_courses(queryset, cursor=None, page_size=None):
+    """
+    Return one page of ``queryset`` ordered newest first.
+
+    Seeks past the cursor with a (created_at, id) comparison instead of an
+    OFFSET, so every page costs the same as the first one.
+    """
+    if page_size is None:
+        page_size = getattr(settings, 'CATALOG_PAGE_SIZE', 12)
+
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    # One extra row tells us whether there is a next page
+    courses = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(courses) > page_size:
+        courses = courses[:page_size]
+        next_cursor = encode_cursor(courses[-1])
+    return CoursePage(courses=courses, next_cursor=next_cursor)
+
+
+def course_card(course):
+    """Compact JSON representation of a catalog card"""
+    return {
+        'id': course.pk,
+        'title': course.title,
+        'slug': course.slug,
+        'url': course.get_absolute_url(),
+        'short_description': course.short_description,
+        'category': {
+            'name': course.category.name,
+            'slug': course.category.slug,
+        } if course.category else None,
+        'thumbnail': course.thumbnail.url if course.thumbnail else None,
+        'original_price': str(course.original_price),
+        'discounted_price': str(course.discounted_price) if course.discounted_price is not None else None,
+        'discount_percentage': course.get_discount_percentage(),
+        'is_free': course.is_free,
+        'level': course.level,
+        'duration_hours': course.duration_hours,
+        'learner_count': course.learner_count,
+        'rating_count': course.rating_count,
+        'average_rating': course.average_rating,
+    }
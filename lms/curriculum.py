@@ -0,0 +1,187 @@
+# lms/curriculum.py
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Course, CurriculumDay, Video, format_duration
+
+
+# Compact, picklable nodes stored in the cache
+VideoNode = namedtuple('VideoNode', [
+    'id', 'title', 'description', 'duration', 'duration_seconds', 'duration_display',
+    'is_free', 'order', 'day_id', 'day_number',
+])
+
+# duration_* are rolled up from the day's videos when the tree is built
+DayNode = namedtuple('DayNode', [
+    'id', 'day_number', 'title', 'description', 'is_free', 'order', 'videos',
+    'duration_seconds', 'duration_display',
+])
+
+
+class CurriculumTree:
+    """
+    Read-only Course -> CurriculumDay -> Video tree for one course.
+
+    Days are ordered by (order, day_number) and videos by (order, id), the
+    same ordering the views used before. ``videos`` is the flattened
+    playback order, used for O(1) previous / next lookups.
+    """
+    __slots__ = (
+        'course_id', 'version', 'days', 'videos', 'duration_seconds', 'duration_display',
+        '_positions', '_days_by_id',
+    )
+
+    def __init__(self, course_id, version, days):
+        self.course_id = course_id
+        self.version = version
+        self.days = tuple(days)
+        self.videos = tuple(video for day in self.days for video in day.videos)
+        self.duration_seconds = sum(day.duration_seconds for day in self.days)
+        self.duration_display = format_duration(self.duration_seconds)
+        self._positions = {video.id: index for index, video in enumerate(self.videos)}
+        self._days_by_id = {day.id: day for day in self.days}
+
+    def __len__(self):
+        return len(self.videos)
+
+    @property
+    def total_videos(self):
+        return len(self.videos)
+
+    @property
+    def first_video(self):
+        return self.videos[0] if self.videos else None
+
+    def get_video(self, video_id):
+        position = self._positions.get(video_id)
+        return self.videos[position] if position is not None else None
+
+    def get_day(self, day_id):
+        return self._days_by_id.get(day_id)
+
+    def day_of(self, video):
+        return self._days_by_id.get(video.day_id)
+
+    def neighbours(self, video_id):
+        """Return (previous, next) video nodes around ``video_id``"""
+        position = self._positions.get(video_id)
+        if position is None:
+            return None, None
+
+        previous_video = self.videos[position - 1] if position > 0 else None
+        next_video = self.videos[position + 1] if position + 1 < len(self.videos) else None
+        return previous_video, next_video
+
+
+def _cache_key(course_id, version):
+    # The "2" is the node layout; bump it when VideoNode/DayNode change
+    return f"curriculum-tree-2:{course_id}:v{version}"
+
+
+def build_curriculum_tree(course):
+    """Build the tree straight from the database (two queries)"""
+    day_rows = CurriculumDay.objects.filter(course=course).order_by(
+        'order', 'day_number'
+    ).values_list('id', 'day_number', 'title', 'description', 'is_free', 'order')
+
+    videos_by_day = {}
+    video_rows = Video.objects.filter(curriculum_day__course=course).order_by(
+        'order', 'id'
+    ).values_list(
+        'id', 'title', 'description', 'duration', 'duration_seconds', 'is_free', 'order',
+        'curriculum_day_id', 'curriculum_day__day_number',
+    )
+    for (video_id, title, description, duration, duration_seconds, is_free, order,
+         day_id, day_number) in video_rows:
+        videos_by_day.setdefault(day_id, []).append(VideoNode(
+            id=video_id,
+            title=title,
+            description=description,
+            duration=duration,
+            duration_seconds=duration_seconds,
+            duration_display=format_duration(duration_seconds),
+            is_free=is_free,
+            order=order,
+            day_id=day_id,
+            day_number=day_number,
+        ))
+
+    days = []
+    for day_id, day_number, title, description, is_free, order in day_rows:
+        videos = tuple(videos_by_day.get(day_id, ()))
+        day_seconds = sum(video.duration_seconds for video in videos)
+        days.append(DayNode(
+            id=day_id,
+            day_number=day_number,
+            title=title,
+            description=description,
+            is_free=is_free,
+            order=order,
+            videos=videos,
+            duration_seconds=day_seconds,
+            duration_display=format_duration(day_seconds),
+        ))
+
+    return CurriculumTree(course.pk, course.curriculum_version, days)
+
+
+def get_curriculum_tree(course):
+    """Return the cached tree for a course, building it on a miss"""
+    key = _cache_key(course.pk, course.curriculum_version)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_curriculum_tree(course)
+        cache.set(key, tree, getattr(settings, 'CURRICULUM_TREE_CACHE_TIMEOUT', 60 * 60 * 24))
+    return tree
+
+
+def get_curriculum_trees(courses):
+    """Return {course_id: tree} for several courses with one cache round-trip"""
+    keys = {_cache_key(course.pk, course.curriculum_version): course for course in courses}
+    cached = cache.get_many(list(keys))
+
+    trees = {}
+    missing = {}
+    for key, course in keys.items():
+        tree = cached.get(key)
+        if tree is None:
+            tree = build_curriculum_tree(course)
+            missing[key] = tree
+        trees[course.pk] = tree
+
+    if missing:
+        cache.set_many(missing, getattr(settings, 'CURRICULUM_TREE_CACHE_TIMEOUT', 60 * 60 * 24))
+    return trees
+
+
+def bump_curriculum_version(course_id):
+    """Invalidate the cached tree of a course"""
+    Course.objects.filter(pk=course_id).update(
+        curriculum_version=F('curriculum_version') + 1
+    )
+
+
+def _video_total_key(course_id):
+    return f"course-video-total:{course_id}"
+
+
+def get_course_video_total(course_id):
+    """Number of videos in a course, cached until a Video/CurriculumDay changes"""
+    key = _video_total_key(course_id)
+    total = cache.get(key)
+    if total is None:
+        total = Video.objects.filter(curriculum_day__course_id=course_id).count()
+        cache.set(key, total, getattr(settings, 'CURRICULUM_TREE_CACHE_TIMEOUT', 60 * 60 * 24))
+    return total
+
+
+def forget_course_video_total(course_id):
+    cache.delete(_video_total_key(course_id))
+
+
+def drop_curriculum_tree(course):
+    """Remove the cached tree of a deleted course"""
+    cache.delete(_cache_key(course.pk, course.curriculum_version))
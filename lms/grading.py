@@ -0,0 +1,151 @@
+# lms/grading.py
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Question, Answer, QuizResponse
+
+
+# Compact, picklable per-question entry stored in the cache
+QuestionKey = namedtuple('QuestionKey', ['question_type', 'points', 'correct_ids', 'answer_ids'])
+
+
+class AnswerKey:
+    """
+    The grading key of one quiz: question id -> QuestionKey.
+
+    Everything needed to validate and score a submission, so grading itself
+    never touches the database.
+    """
+    __slots__ = ('quiz_id', 'questions', 'total_points')
+
+    def __init__(self, quiz_id, questions):
+        self.quiz_id = quiz_id
+        self.questions = questions
+        self.total_points = sum(entry.points for entry in questions.values())
+
+    def __len__(self):
+        return len(self.questions)
+
+    def parse_submission(self, data):
+        """
+        Read ``question_<id>`` fields from POST data and return
+        {question_id: frozenset(answer_ids)}, keeping only answers that belong
+        to the question. Unanswered or invalid questions are left out.
+        """
+        selections = {}
+        for question_id, entry in self.questions.items():
+            selected = set()
+            for value in data.getlist(f"question_{question_id}"):
+                try:
+                    answer_id = int(value)
+                except (TypeError, ValueError):
+                    continue
+                if answer_id in entry.answer_ids:
+                    selected.add(answer_id)
+            if selected:
+                selections[question_id] = frozenset(selected)
+        return selections
+
+    def is_correct(self, question_id, selected_ids):
+        entry = self.questions.get(question_id)
+        if entry is None:
+            return False
+
+        selected_ids = frozenset(selected_ids)
+        if entry.question_type in ('single', 'true_false'):
+            return len(selected_ids) == 1 and selected_ids == entry.correct_ids
+        elif entry.question_type == 'multiple':
+            return selected_ids == entry.correct_ids
+        return False
+
+    def points_for(self, question_id, selected_ids):
+        if self.is_correct(question_id, selected_ids):
+            return self.questions[question_id].points
+        return 0
+
+    def score(self, selections):
+        """Return the earned points for {question_id: answer_ids}"""
+        return sum(
+            self.points_for(question_id, selected_ids)
+            for question_id, selected_ids in selections.items()
+        )
+
+
+def _cache_key(quiz_id):
+    return f"quiz-answer-key:{quiz_id}"
+
+
+def build_answer_key(quiz_id):
+    """Build the key straight from the database (two queries)"""
+    answers = {}
+    correct = {}
+    for question_id, answer_id, is_correct in Answer.objects.filter(
+        question__quiz_id=quiz_id
+    ).values_list('question_id', 'id', 'is_correct'):
+        answers.setdefault(question_id, set()).add(answer_id)
+        if is_correct:
+            correct.setdefault(question_id, set()).add(answer_id)
+
+    questions = {
+        question_id: QuestionKey(
+            question_type=question_type,
+            points=points,
+            correct_ids=frozenset(correct.get(question_id, ())),
+            answer_ids=frozenset(answers.get(question_id, ())),
+        )
+        for question_id, question_type, points in Question.objects.filter(
+            quiz_id=quiz_id
+        ).values_list('id', 'question_type', 'points')
+    }
+    return AnswerKey(quiz_id, questions)
+
+
+def get_answer_key(quiz_id):
+    """Return the cached answer key of a quiz, building it on a miss"""
+    key = _cache_key(quiz_id)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        cache.set(key, answer_key, getattr(settings, 'QUIZ_ANSWER_KEY_CACHE_TIMEOUT', 60 * 60 * 24))
+    return answer_key
+
+
+def forget_answer_key(quiz_id):
+    cache.delete(_cache_key(quiz_id))
+
+
+def load_selections(attempt):
+    """Return {question_id: frozenset(answer_ids)} stored for an attempt (one query)"""
+    through = QuizResponse.selected_answers.through
+    selections = {}
+    for question_id, answer_id in through.objects.filter(
+        quizresponse__attempt=attempt
+    ).values_list('quizresponse__question_id', 'answer_id'):
+        selections.setdefault(question_id, set()).add(answer_id)
+    return {question_id: frozenset(ids) for question_id, ids in selections.items()}
+
+
+def save_responses(attempt, selections, answer_key):
+    """
+    Persist graded responses and their selected answers with two bulk
+    inserts, so result pages never need to grade again.
+    """
+    responses = QuizResponse.objects.bulk_create([
+        QuizResponse(
+            attempt=attempt,
+            question_id=question_id,
+            graded_correct=answer_key.is_correct(question_id, selected_ids),
+            points_earned=answer_key.points_for(question_id, selected_ids),
+        )
+        for question_id, selected_ids in selections.items()
+    ])
+
+    through = QuizResponse.selected_answers.through
+    through.objects.bulk_create([
+        through(quizresponse_id=response.pk, answer_id=answer_id)
+        for response in responses
+        for answer_id in selections[response.question_id]
+    ])
+    return responses
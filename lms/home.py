@@ -0,0 +1,135 @@
+# lms/home.py
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import (
+    HeroSection,
+    FeatureSection,
+    HomeAboutSection,
+    CourseCategory,
+    HomeBanner,
+    Instructor,
+    Testimonial,
+    FAQ,
+    Course,
+)
+
+
+SNAPSHOT_KEY = "home-page-snapshot"
+FRESH_KEY = "home-page-snapshot:fresh"
+LOCK_KEY = "home-page-snapshot:lock"
+
+FEATURED_COURSES = 8
+
+
+class HomePageSnapshot:
+    """
+    Everything the home page renders, materialized into plain lists so the
+    whole page can be pickled into the cache and served without queries.
+    """
+
+    def __init__(self, hero, feature_section, about_section, categories, courses,
+                 all_courses_count, banner, instructors, testimonials, faqs):
+        self.hero = hero
+        self.feature_section = feature_section
+        self.about_section = about_section
+        self.categories = categories
+        self.courses = courses
+        self.all_courses_count = all_courses_count
+        self.banner = banner
+        self.instructors = instructors
+        self.testimonials = testimonials
+        self.faqs = faqs
+
+    @classmethod
+    def build(cls):
+        """Build a snapshot straight from the database"""
+        feature_section = FeatureSection.objects.filter(
+            is_active=True
+        ).prefetch_related('items').first()
+
+        active_courses = Course.objects.filter(is_active=True)
+
+        # Featured courses first, topped up with the newest other courses
+        courses = list(
+            active_courses.select_related('category')
+            .order_by('-is_featured', '-created_at')[:FEATURED_COURSES]
+        )
+
+        return cls(
+            hero=HeroSection.objects.filter(is_active=True).first(),
+            feature_section=feature_section,
+            about_section=HomeAboutSection.objects.filter(is_active=True).first(),
+            categories=list(CourseCategory.objects.filter(is_active=True).order_by('order')),
+            courses=courses,
+            all_courses_count=active_courses.count(),
+            banner=HomeBanner.objects.filter(is_active=True).first(),
+            instructors=list(Instructor.objects.all()),
+            testimonials=list(Testimonial.objects.filter(is_active=True)),
+            faqs=list(FAQ.objects.filter(is_active=True)),
+        )
+
+    def as_context(self):
+        return {
+            'hero': self.hero,
+            'feature_section': self.feature_section,
+            'about_section': self.about_section,
+            'categories': self.categories,
+            'courses': self.courses,
+            'all_courses_count': self.all_courses_count,
+            'banner': self.banner,
+            'instructors': self.instructors,
+            'testimonials': self.testimonials,
+            'faqs': self.faqs,
+        }
+
+
+def _rebuild():
+    snapshot = HomePageSnapshot.build()
+    cache.set(SNAPSHOT_KEY, snapshot, getattr(settings, 'HOME_SNAPSHOT_MAX_AGE', 60 * 60 * 24))
+    cache.set(FRESH_KEY, True, getattr(settings, 'HOME_SNAPSHOT_FRESH_SECONDS', 300))
+    return snapshot
+
+
+def get_home_snapshot():
+    """
+    Return the home page snapshot (stale-while-revalidate).
+
+    A fresh snapshot is served as is. A stale one is rebuilt by whichever
+    request takes the lock while everyone else keeps serving the stale copy.
+    On a cold cache, requests that lose the lock wait briefly for the winner
+    instead of all hitting the database.
+    """
+    cached = cache.get_many([SNAPSHOT_KEY, FRESH_KEY])
+    snapshot = cached.get(SNAPSHOT_KEY)
+    fresh = cached.get(FRESH_KEY, False)
+
+    if snapshot is not None and fresh:
+        return snapshot
+
+    lock_seconds = getattr(settings, 'HOME_SNAPSHOT_LOCK_SECONDS', 30)
+    if cache.add(LOCK_KEY, True, lock_seconds):
+        try:
+            return _rebuild()
+        finally:
+            cache.delete(LOCK_KEY)
+
+    if snapshot is not None:
+        return snapshot
+
+    # Cold cache and someone else is building it
+    deadline = time.monotonic() + getattr(settings, 'HOME_SNAPSHOT_WAIT_SECONDS', 2)
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        snapshot = cache.get(SNAPSHOT_KEY)
+        if snapshot is not None:
+            return snapshot
+
+    return HomePageSnapshot.build()
+
+
+def mark_home_snapshot_stale():
+    """Keep the current snapshot but make the next request rebuild it"""
+    cache.delete(FRESH_KEY)
@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from lms.management.commands.benchmark_journey import summarize
+
+
+def _conninfo():
+    """libpq connection string for the default database"""
+    from psycopg.conninfo import make_conninfo
+
+    params = connection.get_connection_params()
+    # Python-level options that aren't libpq parameters
+    for key in ('cursor_factory', 'context', 'prepare_threshold', 'pool'):
+        params.pop(key, None)
+    return make_conninfo(**{key: value for key, value in params.items() if value not in (None, '')})
+
+
+def _worker(mode, conninfo, requests, pool_size, queue):
+    """One simulated web worker: acquire a connection, run SELECT 1, release it"""
+    import psycopg
+
+    timings = []
+    pool = None
+    if mode == 'pool':
+        from psycopg_pool import ConnectionPool
+
+        pool = ConnectionPool(
+            conninfo, min_size=pool_size, max_size=pool_size,
+            check=ConnectionPool.check_connection, open=True,
+        )
+        pool.wait()
+
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            if pool is not None:
+                with pool.connection() as conn:
+                    conn.execute("SELECT 1")
+            else:
+                # What CONN_MAX_AGE=0 without a pool does on every request
+                with psycopg.connect(conninfo) as conn:
+                    conn.execute("SELECT 1")
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        if pool is not None:
+            pool.close()
+    queue.put(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request connection overhead of connect-per-request against "
+        "psycopg's connection pool for several worker counts (Postgres only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help="Comma-separated worker counts")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per worker")
+        parser.add_argument('--pool-size', type=int, default=2, help="Pool size per worker")
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Connection benchmarks need a Postgres DATABASE_URL")
+
+        conninfo = _conninfo()
+        worker_counts = [int(value) for value in options['workers'].split(',') if value.strip()]
+        # Forked workers must not inherit an open connection
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+
+        results = []
+        for workers in worker_counts:
+            for mode in ('connect', 'pool'):
+                queue = context.Queue()
+                processes = [
+                    context.Process(
+                        target=_worker,
+                        args=(mode, conninfo, options['requests'], options['pool_size'], queue),
+                    )
+                    for _ in range(workers)
+                ]
+                started = time.perf_counter()
+                for process in processes:
+                    process.start()
+                timings = []
+                for _ in processes:
+                    timings.extend(queue.get())
+                for process in processes:
+                    process.join()
+                elapsed = time.perf_counter() - started
+
+                results.append({
+                    'workers': workers,
+                    'mode': mode,
+                    'requests': len(timings),
+                    'requests_per_second': round(len(timings) / elapsed, 1),
+                    'latency_ms': summarize(timings, digits=3),
+                })
+                self.stderr.write(
+                    f"{workers} worker(s), {mode}: p50 {results[-1]['latency_ms']['p50']}ms, "
+                    f"p95 {results[-1]['latency_ms']['p95']}ms"
+                )
+
+        data = json.dumps({'pool_size': options['pool_size'], 'results': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(data + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(data)
@@ -0,0 +1,227 @@
+import json
+import math
+import subprocess
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from lms.management.commands.seed_benchmark_data import EMAIL_DOMAIN
+from lms.middleware import QueryStats, SessionRefreshMiddleware
+from lms.models import Answer, CourseProgress, QuizAttempt, Video
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values, digits=2):
+    summary = {f'p{pct}': round(percentile(values, pct), digits) for pct in PERCENTILES}
+    summary['mean'] = round(sum(values) / len(values), digits)
+    summary['max'] = round(max(values), digits)
+    return summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the learner journey (home, catalog, course detail, player, progress "
+        "heartbeats, quiz, result, achievements) through the Django test client "
+        "against seed_benchmark_data learners and report latency percentiles, "
+        "queries per request and allocations per view as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help="Measured journeys")
+        parser.add_argument('--warmup', type=int, default=2, help="Unmeasured journeys run first")
+        parser.add_argument('--learners', type=int, default=10, help="Seeded learners to rotate through")
+        parser.add_argument('--heartbeats', type=int, default=5, help="Progress heartbeats per journey")
+        parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+        parser.add_argument('--compare', help="Earlier JSON report to print deltas against")
+
+    def handle(self, *args, **options):
+        journeys = self._journeys(options['learners'])
+        self.heartbeats = options['heartbeats']
+        self.samples = {}
+
+        # The test client speaks plain HTTP; don't let production settings redirect it
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], SECURE_SSL_REDIRECT=False,
+        ):
+            for n in range(options['warmup']):
+                self._run_journey(journeys[n % len(journeys)], measure=False)
+            for n in range(options['iterations']):
+                self._run_journey(journeys[n % len(journeys)], measure=True)
+            # One extra pass under tracemalloc, kept out of the latency numbers
+            tracemalloc.start()
+            try:
+                self._run_journey(journeys[0], measure=False, trace=True)
+            finally:
+                tracemalloc.stop()
+
+        report = self._report(options)
+        data = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(data + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(data)
+
+        if options['compare']:
+            self._compare(report, options['compare'])
+
+    # -----------------------------
+    # Setup
+    # -----------------------------
+    def _journeys(self, count):
+        """(user, course, video, quiz answers) for learners that finished a paid course"""
+        finished = list(
+            CourseProgress.objects.filter(
+                user__email__endswith=f'@{EMAIL_DOMAIN}',
+                total_count__gt=0,
+                completed_count=F('total_count'),
+                course__quiz__isnull=False,
+                course__is_free=False,
+            ).select_related('user', 'course__quiz').order_by('id')[:count]
+        )
+        if not finished:
+            raise CommandError("No benchmark learners found; run seed_benchmark_data first")
+
+        journeys = []
+        for progress in finished:
+            course = progress.course
+            # First video of day 2: a paid video, so access checks run
+            video = Video.objects.filter(
+                curriculum_day__course=course, curriculum_day__day_number=2
+            ).order_by('order', 'id').first() or Video.objects.filter(
+                curriculum_day__course=course
+            ).order_by('id').first()
+            answers = {}
+            for question_id, answer_id in Answer.objects.filter(
+                question__quiz=course.quiz, is_correct=True
+            ).values_list('question_id', 'id'):
+                answers.setdefault(f'question_{question_id}', []).append(str(answer_id))
+            journeys.append((progress.user, course, video, answers))
+        return journeys
+
+    # -----------------------------
+    # Journey
+    # -----------------------------
+    def _run_journey(self, journey, measure, trace=False):
+        user, course, video, answers = journey
+        client = Client()
+        client.force_login(user)
+        # As if signed in through the login view, which SessionRefreshMiddleware
+        # would otherwise catch up on during the first measured request
+        session = client.session
+        session[SessionRefreshMiddleware.KEY] = int(time.time())
+        session.save()
+
+        steps = [
+            ('home', lambda: client.get(reverse('home'))),
+            ('catalog', lambda: client.get(reverse('all_courses'))),
+            ('course_detail', lambda: client.get(reverse('course_detail', args=[course.slug]))),
+            ('video_player', lambda: client.get(reverse('video_player', args=[video.id]))),
+        ]
+        for beat in range(1, self.heartbeats + 1):
+            steps.append(('progress_heartbeat', lambda beat=beat: client.post(
+                reverse('update_video_progress', args=[video.id]),
+                {'progress': min(100, beat * 20), 'watched_seconds': beat * 30},
+            )))
+        steps.append(('quiz_take', lambda: client.get(reverse('quiz_take', args=[course.slug]))))
+        for name, request in steps:
+            self._step(name, request, measure, trace)
+
+        # quiz_take just created the attempt; look it up outside the measurement
+        attempt = QuizAttempt.objects.filter(
+            user=user, quiz=course.quiz, completed_at__isnull=True
+        ).order_by('-id').first()
+        self._step('quiz_submit', lambda: client.post(
+            reverse('quiz_submit', args=[attempt.id]), answers
+        ), measure, trace)
+        self._step('quiz_result', lambda: client.get(reverse('quiz_result', args=[attempt.id])), measure, trace)
+        self._step('achievements', lambda: client.get(reverse('my_achievements')), measure, trace)
+
+    def _step(self, name, request, measure, trace):
+        if trace:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            response = request()
+            _, peak = tracemalloc.get_traced_memory()
+            sample = self.samples.setdefault(name, {'latency': [], 'queries': [], 'db': []})
+            sample['alloc_kb'] = round((peak - before) / 1024, 1)
+        else:
+            with QueryStats() as stats:
+                started = time.perf_counter()
+                response = request()
+                elapsed = time.perf_counter() - started
+            if measure:
+                sample = self.samples.setdefault(name, {'latency': [], 'queries': [], 'db': []})
+                sample['latency'].append(elapsed * 1000)
+                sample['queries'].append(stats.count)
+                sample['db'].append(stats.duration_ms)
+
+        if response.status_code >= 400:
+            raise CommandError(f"{name} returned HTTP {response.status_code}")
+
+    # -----------------------------
+    # Report
+    # -----------------------------
+    def _report(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        steps = {}
+        for name, sample in self.samples.items():
+            if not sample['latency']:
+                continue
+            steps[name] = {
+                'requests': len(sample['latency']),
+                'latency_ms': summarize(sample['latency']),
+                'queries': summarize(sample['queries'], digits=1),
+                'db_ms': summarize(sample['db']),
+                'alloc_kb': sample.get('alloc_kb'),
+            }
+
+        return {
+            'commit': commit,
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'learners': options['learners'],
+            'steps': steps,
+        }
+
+    def _compare(self, report, path):
+        with open(path) as handle:
+            baseline = json.load(handle)
+
+        self.stdout.write(f"\nAgainst {baseline.get('commit') or path}:")
+        for name, current in report['steps'].items():
+            before = baseline.get('steps', {}).get(name)
+            if not before:
+                self.stdout.write(f"  {name}: new")
+                continue
+            p95 = current['latency_ms']['p95'] - before['latency_ms']['p95']
+            queries = current['queries']['mean'] - before['queries']['mean']
+            self.stdout.write(
+                f"  {name}: p95 {current['latency_ms']['p95']:.1f}ms ({p95:+.1f}), "
+                f"queries {current['queries']['mean']:.1f} ({queries:+.1f})"
+            )
@@ -0,0 +1,164 @@
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Just enough of Razorpay's v1 orders API for checkout, plus injected
+    latency and failures. Settings live on the server (see make_server).
+    """
+    # Keep-alive, like the real API
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path.rstrip('/') != '/v1/orders':
+            return self._error(404, 'BAD_REQUEST_ERROR', "The requested URL was not found on the server.")
+        if self._inject_failure():
+            return
+        try:
+            data = json.loads(body or b'{}')
+            amount = int(data['amount'])
+        except (KeyError, TypeError, ValueError):
+            return self._error(400, 'BAD_REQUEST_ERROR', "The amount field is required.")
+        if amount < 100:
+            return self._error(400, 'BAD_REQUEST_ERROR', "Order amount less than minimum amount allowed")
+
+        order = {
+            'id': f"order_{secrets.token_hex(7)}",
+            'entity': 'order',
+            'amount': amount,
+            'amount_paid': 0,
+            'amount_due': amount,
+            'currency': data.get('currency', 'INR'),
+            'receipt': data.get('receipt'),
+            'status': 'created',
+            'attempts': 0,
+            'notes': data.get('notes', []),
+            'created_at': int(time.time()),
+        }
+        with self.server.lock:
+            self.server.orders[order['id']] = order
+        self._send(200, order)
+
+    def do_GET(self):
+        prefix = '/v1/orders/'
+        if not self.path.startswith(prefix):
+            return self._error(404, 'BAD_REQUEST_ERROR', "The requested URL was not found on the server.")
+        if self._inject_failure():
+            return
+        order = self.server.orders.get(self.path[len(prefix):].rstrip('/'))
+        if order is None:
+            return self._error(400, 'BAD_REQUEST_ERROR', "The id provided does not exist")
+        self._send(200, order)
+
+    def _inject_failure(self):
+        """Apply latency and maybe fail; True if the request was already answered"""
+        server = self.server
+        if not self.headers.get('Authorization', '').startswith('Basic '):
+            self._error(401, 'BAD_REQUEST_ERROR', "Authentication failed")
+            return True
+
+        with server.lock:
+            server.requests += 1
+            fail_first = server.fail_first > 0
+            if fail_first:
+                server.fail_first -= 1
+
+        time.sleep(max(0.0, random.gauss(server.latency, server.jitter)))
+
+        if random.random() < server.reset_rate:
+            # Drop the connection without answering
+            self.close_connection = True
+            self.connection.close()
+            return True
+        if random.random() < server.hang_rate:
+            # Longer than any sane read timeout
+            time.sleep(server.hang_seconds)
+        if fail_first or random.random() < server.error_rate:
+            self._error(500, 'SERVER_ERROR', "We are facing some trouble completing your request at the moment.")
+            return True
+        return False
+
+    def _error(self, status, code, description):
+        self._send(status, {'error': {'code': code, 'description': description}})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                hang_rate=0.0, hang_seconds=30.0, reset_rate=0.0, fail_first=0, verbose=False):
+    """Build a stub server; port=0 picks a free port (see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.orders = {}
+    server.requests = 0
+    server.latency = latency_ms / 1000
+    server.jitter = jitter_ms / 1000
+    server.error_rate = error_rate
+    server.hang_rate = hang_rate
+    server.hang_seconds = hang_seconds
+    server.reset_rate = reset_rate
+    server.fail_first = fail_first
+    server.verbose = verbose
+    return server
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in for the Razorpay orders API with configurable "
+        "latency and failures. Point RAZORPAY_BASE_URL at it to load-test "
+        "checkout offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency-ms', type=float, default=150, help="Mean response time")
+        parser.add_argument('--jitter-ms', type=float, default=50, help="Standard deviation of the response time")
+        parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests answered with HTTP 500")
+        parser.add_argument('--hang-rate', type=float, default=0.0, help="Share of requests that stall for --hang-seconds")
+        parser.add_argument('--hang-seconds', type=float, default=30.0)
+        parser.add_argument('--reset-rate', type=float, default=0.0, help="Share of connections dropped without a response")
+        parser.add_argument('--fail-first', type=int, default=0, help="Answer the first N requests with HTTP 500")
+
+    def handle(self, *args, **options):
+        server = make_server(
+            options['host'], options['port'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            error_rate=options['error_rate'],
+            hang_rate=options['hang_rate'],
+            hang_seconds=options['hang_seconds'],
+            reset_rate=options['reset_rate'],
+            fail_first=options['fail_first'],
+            verbose=options['verbosity'] > 1,
+        )
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(
+            f"Razorpay stub on http://{host}:{port} (set RAZORPAY_BASE_URL to this). Ctrl-C to stop."
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Served {server.requests} API requests, created {len(server.orders)} orders")
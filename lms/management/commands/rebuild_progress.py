@@ -0,0 +1,211 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef
+
+from lms.models import Course, CourseProgress, UserVideoProgress, Video
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile UserVideoProgress with CourseProgress.completed_videos (a video "
+        "completed in either is completed in both), recompute the counters, in "
+        "chunks, and report how far they had drifted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', help="Only this course (slug or id)")
+        parser.add_argument('--user', help="Only this user (email or id)")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without writing")
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.dry_run = options['dry_run']
+        course = self._get_course(options['course'])
+        user = self._get_user(options['user'])
+
+        self.stats = {
+            'progress_rows': 0,
+            'created_rows': 0,
+            'counter_drift': 0,
+            'missing_m2m': 0,
+            'm2m_only': 0,
+        }
+
+        # One GROUP BY for every course's video total
+        totals = Video.objects.all()
+        if course:
+            totals = totals.filter(curriculum_day__course=course)
+        self.totals = dict(
+            totals.values_list('curriculum_day__course_id').annotate(total=Count('id'))
+        )
+
+        self._create_missing_rows(course, user)
+
+        progress = CourseProgress.objects.all()
+        if course:
+            progress = progress.filter(course=course)
+        if user:
+            progress = progress.filter(user=user)
+
+        # Keyset over primary keys keeps every chunk the same cost and memory
+        last_id = 0
+        while True:
+            chunk = list(
+                progress.filter(id__gt=last_id).order_by('id').only(
+                    'id', 'user_id', 'course_id', 'completed_count', 'total_count', 'progress_percentage'
+                )[:self.chunk_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            self._rebuild_chunk(chunk)
+
+        prefix = "[dry run] " if self.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Checked {self.stats['progress_rows']} progress rows "
+            f"(created {self.stats['created_rows']}): "
+            f"{self.stats['counter_drift']} had stale counters, "
+            f"{self.stats['missing_m2m']} completed videos were missing from completed_videos, "
+            f"{self.stats['m2m_only']} were only in completed_videos"
+        ))
+
+    # -----------------------------
+    # Scope
+    # -----------------------------
+    def _get_course(self, value):
+        if not value:
+            return None
+        lookup = {'pk': value} if value.isdigit() else {'slug': value}
+        try:
+            return Course.objects.get(**lookup)
+        except Course.DoesNotExist:
+            raise CommandError(f"Course {value!r} not found")
+
+    def _get_user(self, value):
+        if not value:
+            return None
+        User = get_user_model()
+        lookup = {'pk': value} if value.isdigit() else {'email': value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User {value!r} not found")
+
+    def _completed_progress(self, course, user):
+        rows = UserVideoProgress.objects.filter(is_completed=True)
+        if course:
+            rows = rows.filter(video__curriculum_day__course=course)
+        if user:
+            rows = rows.filter(user=user)
+        return rows
+
+    # -----------------------------
+    # Rebuild
+    # -----------------------------
+    def _create_missing_rows(self, course, user):
+        """Create CourseProgress for (user, course) pairs that have completed videos but no row"""
+        pairs = self._completed_progress(course, user).annotate(
+            course_id=F('video__curriculum_day__course_id')
+        ).values('user_id', 'course_id').distinct().filter(
+            ~Exists(CourseProgress.objects.filter(
+                user_id=OuterRef('user_id'),
+                course_id=OuterRef('course_id'),
+            ))
+        )
+
+        batch = []
+        for pair in pairs.iterator(chunk_size=self.chunk_size):
+            batch.append(CourseProgress(user_id=pair['user_id'], course_id=pair['course_id']))
+            if len(batch) >= self.chunk_size:
+                self._bulk_create_progress(batch)
+                batch = []
+        self._bulk_create_progress(batch)
+
+    def _bulk_create_progress(self, batch):
+        if not batch:
+            return
+        self.stats['created_rows'] += len(batch)
+        if not self.dry_run:
+            CourseProgress.objects.bulk_create(batch, ignore_conflicts=True)
+
+    def _rebuild_chunk(self, chunk):
+        through = CourseProgress.completed_videos.through
+        progress_ids = [row.id for row in chunk]
+        by_pair = {(row.user_id, row.course_id): row for row in chunk}
+
+        # Completed videos per (user, course) according to UserVideoProgress
+        completed = {}
+        for user_id, course_id, video_id in UserVideoProgress.objects.filter(
+            is_completed=True,
+            user_id__in={row.user_id for row in chunk},
+            video__curriculum_day__course_id__in={row.course_id for row in chunk},
+        ).values_list('user_id', 'video__curriculum_day__course_id', 'video_id'):
+            row = by_pair.get((user_id, course_id))
+            if row is not None:
+                completed.setdefault(row.id, set()).add(video_id)
+
+        # ... and according to the completed_videos M2M (this course's videos
+        # only, like recount_course_progress)
+        linked = {}
+        course_ids = {row.id: row.course_id for row in chunk}
+        for progress_id, video_id, course_id in through.objects.filter(
+            courseprogress_id__in=progress_ids
+        ).values_list('courseprogress_id', 'video_id', 'video__curriculum_day__course_id'):
+            if course_ids[progress_id] == course_id:
+                linked.setdefault(progress_id, set()).add(video_id)
+
+        new_links = []
+        newly_completed = []
+        changed = []
+        for row in chunk:
+            done = completed.get(row.id, set())
+            links = linked.get(row.id, set())
+
+            # Never un-complete a video: either source counts, in both directions
+            missing = done - links
+            m2m_only = links - done
+            self.stats['missing_m2m'] += len(missing)
+            self.stats['m2m_only'] += len(m2m_only)
+            new_links.extend(
+                through(courseprogress_id=row.id, video_id=video_id) for video_id in missing
+            )
+            newly_completed.extend(
+                UserVideoProgress(user_id=row.user_id, video_id=video_id, is_completed=True, watched_percentage=100)
+                for video_id in m2m_only
+            )
+
+            completed_count = len(done | links)
+            total_count = self.totals.get(row.course_id, 0)
+            percentage = CourseProgress.percentage(completed_count, total_count)
+
+            if (row.completed_count, row.total_count, row.progress_percentage) != (
+                completed_count, total_count, percentage
+            ):
+                row.completed_count = completed_count
+                row.total_count = total_count
+                row.progress_percentage = percentage
+                changed.append(row)
+
+        self.stats['progress_rows'] += len(chunk)
+        self.stats['counter_drift'] += len(changed)
+
+        if self.dry_run:
+            return
+
+        with transaction.atomic():
+            if new_links:
+                through.objects.bulk_create(new_links, ignore_conflicts=True)
+            if newly_completed:
+                # Rows that exist are only flipped to completed; their watch time stays
+                UserVideoProgress.objects.bulk_create(
+                    newly_completed,
+                    update_conflicts=True,
+                    unique_fields=['user', 'video'],
+                    update_fields=['is_completed'],
+                )
+            if changed:
+                CourseProgress.objects.bulk_update(
+                    changed, ['completed_count', 'total_count', 'progress_percentage']
+                )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.models import Course
+from lms.stats import COUNTER_FIELDS, compute_course_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount Course learner and rating counters from purchases, enrollments "
+        "and reviews, and report how far they had drifted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', help="Only this course (slug or id)")
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without writing")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['course']:
+            value = options['course']
+            lookup = {'pk': value} if value.isdigit() else {'slug': value}
+            courses = courses.filter(**lookup)
+            if not courses.exists():
+                raise CommandError(f"Course {value!r} not found")
+
+        checked = 0
+        drifted = []
+        last_id = 0
+        while True:
+            chunk = list(
+                courses.filter(id__gt=last_id).order_by('id')
+                .only('id', 'slug', *COUNTER_FIELDS)[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            checked += len(chunk)
+
+            fresh = compute_course_stats(Course.objects.filter(id__in=[course.id for course in chunk]))
+            changed = []
+            for course in chunk:
+                values = fresh[course.id]
+                diff = {
+                    field: (getattr(course, field), value)
+                    for field, value in values.items()
+                    if getattr(course, field) != value
+                }
+                if diff:
+                    for field, (_, value) in diff.items():
+                        setattr(course, field, value)
+                    changed.append(course)
+                    drifted.append((course.slug, diff))
+
+            if changed and not options['dry_run']:
+                Course.objects.bulk_update(changed, COUNTER_FIELDS)
+
+        for slug, diff in drifted:
+            details = ', '.join(f"{field} {old} -> {new}" for field, (old, new) in diff.items())
+            self.stdout.write(f"  {slug}: {details}")
+
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Checked {checked} courses: {len(drifted)} had stale counters"
+        ))
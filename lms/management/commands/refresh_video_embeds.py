@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from lms.models import Video, parse_video_url
+
+
+class Command(BaseCommand):
+    help = "Re-derive provider, provider video id and embed URL for every video"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many videos would change")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fields = ['provider', 'provider_video_id', 'resolved_embed_url']
+
+        checked = 0
+        changed = []
+        updated = 0
+
+        videos = Video.objects.only('id', 'video_url', *fields).order_by('id')
+        for video in videos.iterator(chunk_size=batch_size):
+            checked += 1
+            metadata = parse_video_url(video.video_url)
+            if metadata == (video.provider, video.provider_video_id, video.resolved_embed_url):
+                continue
+
+            video.provider, video.provider_video_id, video.resolved_embed_url = metadata
+            changed.append(video)
+
+            if len(changed) >= batch_size:
+                updated += self._write(changed, fields, options['dry_run'])
+                changed = []
+
+        updated += self._write(changed, fields, options['dry_run'])
+
+        verb = "would change" if options['dry_run'] else "updated"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} videos, {verb} {updated}"))
+
+    def _write(self, videos, fields, dry_run):
+        if videos and not dry_run:
+            # bulk_update skips Video.save() and its signals; the curriculum
+            # tree doesn't store embed data, so nothing else needs refreshing
+            Video.objects.bulk_update(videos, fields)
+        return len(videos)
@@ -0,0 +1,349 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from lms.catalog import forget_catalog_facets
+from lms.home import mark_home_snapshot_stale
+from lms.models import (
+    Answer, Certificate, Course, CourseCategory, CourseEnrollment, CourseProgress,
+    CurriculumDay, Purchase, Question, Quiz, QuizAttempt, QuizResponse,
+    UserVideoProgress, Video, parse_duration, parse_video_url,
+)
+from lms.search import refresh_search_documents
+from lms.skills import sync_course_skills
+from lms.stats import COUNTER_FIELDS, compute_course_stats
+
+
+EMAIL_DOMAIN = 'bench.example.com'
+SLUG_PREFIX = 'bench-'
+PASSWORD = 'bench-password'
+
+SKILLS = ['Python', 'Django', 'React', 'JavaScript', 'HTML', 'CSS', 'SQL', 'Docker', 'AWS', 'Git']
+TOOLS = ['VSCode', 'GitHub', 'Figma', 'Docker', 'Postman', 'Jupyter', 'Jira']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset (users, curricula, purchases, "
+        "progress, quiz attempts, certificates) for load tests and benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--courses', type=int, default=20)
+        parser.add_argument('--days', type=int, default=30, help="Curriculum days per course")
+        parser.add_argument('--videos-per-day', type=int, default=5)
+        parser.add_argument('--questions', type=int, default=20, help="Quiz questions per course")
+        parser.add_argument('--courses-per-user', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per bulk_create batch")
+        parser.add_argument('--user-chunk', type=int, default=500, help="Users generated per transaction")
+        parser.add_argument('--flush', action='store_true', help="Delete earlier benchmark data first")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.counts = {}
+        self.certificate_serial = 0
+        self.now = timezone.now()
+
+        User = get_user_model()
+        existing = (
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists()
+            or Course.objects.filter(slug__startswith=SLUG_PREFIX).exists()
+        )
+        if existing:
+            if not options['flush']:
+                raise CommandError("Benchmark data already exists; pass --flush to replace it")
+            self._flush()
+
+        plans = self._create_courses(options)
+
+        # One shared hash: hashing a password per user would dominate the run
+        password = make_password(PASSWORD)
+        courses_per_user = min(options['courses_per_user'], len(plans))
+        for start in range(0, options['users'], options['user_chunk']):
+            stop = min(start + options['user_chunk'], options['users'])
+            with transaction.atomic():
+                users = self._bulk(User, [
+                    User(email=f'learner{n}@{EMAIL_DOMAIN}', username=f'bench-learner{n}', password=password)
+                    for n in range(start, stop)
+                ])
+                self._create_activity(users, plans, courses_per_user)
+            self.stdout.write(f"  {stop}/{options['users']} users")
+
+        self._refresh_derived([plan['course'] for plan in plans])
+
+        for label, count in self.counts.items():
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded benchmark data in {time.monotonic() - started:.1f}s "
+            f"(log in as learner0@{EMAIL_DOMAIN} / {PASSWORD})"
+        ))
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+    def _bulk(self, model, objects):
+        """bulk_create in chunks and return the saved objects (with primary keys)"""
+        created = model.objects.bulk_create(objects, batch_size=self.chunk_size)
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + len(created)
+        return created
+
+    def _bulk_stream(self, model, objects):
+        """bulk_create from a generator without holding every row in memory"""
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.chunk_size:
+                self._bulk(model, batch)
+                batch = []
+        if batch:
+            self._bulk(model, batch)
+
+    def _flush(self):
+        self.stdout.write("Deleting earlier benchmark data...")
+        get_user_model().objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+        Course.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+
+    # -----------------------------
+    # Catalog
+    # -----------------------------
+    def _create_courses(self, options):
+        rng = self.rng
+        category, _ = CourseCategory.objects.get_or_create(
+            slug=f'{SLUG_PREFIX}category', defaults={'name': 'Benchmark'}
+        )
+        videos_per_course = options['days'] * options['videos_per_day']
+
+        courses = self._bulk(Course, [
+            Course(
+                title=f"Benchmark Course {n}",
+                slug=f'{SLUG_PREFIX}course-{n}',
+                short_description=f"Synthetic course {n} for benchmarks",
+                description="<p>Generated by seed_benchmark_data</p>",
+                category=category,
+                original_price=Decimal(rng.choice([999, 1999, 4999])),
+                is_free=n % 5 == 0,
+                duration_hours=rng.randint(10, 80),
+                total_videos=videos_per_course,
+                total_learners='0',
+                payment_type='One time',
+                skills=', '.join(rng.sample(SKILLS, 4)),
+                tools_learned=', '.join(rng.sample(TOOLS, 3)),
+                is_featured=n % 7 == 0,
+            )
+            for n in range(options['courses'])
+        ])
+
+        days = self._bulk(CurriculumDay, [
+            CurriculumDay(course=course, day_number=d, order=d, title=f"Day {d}", is_free=d == 1)
+            for course in courses for d in range(1, options['days'] + 1)
+        ])
+
+        videos = []
+        for day in days:
+            for v in range(options['videos_per_day']):
+                url = f"https://www.youtube.com/watch?v=b{day.pk:08d}{v:02d}"
+                provider, provider_video_id, embed_url = parse_video_url(url)
+                duration = f"{rng.randint(3, 25)}:{rng.randint(0, 59):02d}"
+                videos.append(Video(
+                    curriculum_day=day, title=f"Day {day.day_number} lesson {v + 1}",
+                    video_url=url, duration=duration, duration_seconds=parse_duration(duration),
+                    provider=provider, provider_video_id=provider_video_id,
+                    resolved_embed_url=embed_url, order=v,
+                ))
+        videos = self._bulk(Video, videos)
+
+        quizzes = self._bulk(Quiz, [
+            Quiz(course=course, title=f"{course.title} final quiz", max_attempts=0)
+            for course in courses
+        ])
+        questions = self._bulk(Question, [
+            Question(quiz=quiz, question_text=f"Question {q + 1}", order=q)
+            for quiz in quizzes for q in range(options['questions'])
+        ])
+        answers = self._bulk(Answer, [
+            Answer(question=question, answer_text=f"Option {a + 1}", is_correct=a == 0, order=a)
+            for question in questions for a in range(4)
+        ])
+
+        # Everything the activity generator needs, without further queries
+        answers_by_question = {}
+        for answer in answers:
+            answers_by_question.setdefault(answer.question_id, []).append(answer)
+        questions_by_quiz = {}
+        for question in questions:
+            questions_by_quiz.setdefault(question.quiz_id, []).append(
+                (question, answers_by_question[question.pk])
+            )
+        video_ids = {}
+        for video in videos:
+            video_ids.setdefault(video.curriculum_day.course_id, []).append(video.pk)
+
+        return [
+            {
+                'course': course,
+                'video_ids': video_ids[course.pk],
+                'quiz': quiz,
+                'questions': questions_by_quiz[quiz.pk],
+            }
+            for course, quiz in zip(courses, quizzes)
+        ]
+
+    # -----------------------------
+    # Learner activity
+    # -----------------------------
+    def _create_activity(self, users, plans, courses_per_user):
+        rng = self.rng
+        purchases, enrollments, progress_rows = [], [], []
+        watched = []   # (user_id, video_id, is_completed, watched_percentage)
+        finished = []  # (user, plan) that watched every video
+
+        for user in users:
+            for plan in rng.sample(plans, courses_per_user):
+                course = plan['course']
+                joined = self.now - timedelta(days=rng.randint(0, 365))
+
+                if course.is_free:
+                    enrollments.append(CourseEnrollment(user=user, course=course, enrollment_type='free'))
+                else:
+                    status = 'completed' if rng.random() < 0.9 else 'pending'
+                    purchases.append(Purchase(
+                        user=user, course=course, amount_paid=course.original_price,
+                        payment_status=status, transaction_id=f'bench_{user.pk}_{course.pk}',
+                        purchased_at=joined, full_name=user.username, email=user.email,
+                    ))
+                    if status != 'completed':
+                        continue
+
+                # Long tail: most learners stop early, a few finish
+                total = len(plan['video_ids'])
+                done = min(total, int(total * rng.random() ** 2 * 1.3))
+                completed_ids = plan['video_ids'][:done]
+                watched.extend((user.pk, video_id, True, 100) for video_id in completed_ids)
+                if done < total:
+                    watched.append((user.pk, plan['video_ids'][done], False, rng.randint(5, 85)))
+
+                progress_rows.append((
+                    CourseProgress(
+                        user=user, course=course, completed_count=done, total_count=total,
+                        progress_percentage=(Decimal(done) * 100 / total).quantize(Decimal('0.01')),
+                    ),
+                    completed_ids,
+                ))
+                if done == total:
+                    finished.append((user, plan))
+
+        self._bulk(Purchase, purchases)
+        self._bulk(CourseEnrollment, enrollments)
+        self._bulk_stream(UserVideoProgress, (
+            UserVideoProgress(
+                user_id=user_id, video_id=video_id, is_completed=is_completed,
+                watched_percentage=percentage,
+            )
+            for user_id, video_id, is_completed, percentage in watched
+        ))
+
+        progress = self._bulk(CourseProgress, [row for row, _ in progress_rows])
+        through = CourseProgress.completed_videos.through
+        self._bulk_stream(through, (
+            through(courseprogress_id=row.pk, video_id=video_id)
+            for row, (_, completed_ids) in zip(progress, progress_rows)
+            for video_id in completed_ids
+        ))
+
+        self._create_quiz_activity(finished, {(row.user_id, row.course_id): row for row in progress})
+
+    def _create_quiz_activity(self, finished, progress_by_pair):
+        rng = self.rng
+        attempts = []  # (attempt, plan, [(question, answer, is_correct)])
+        for user, plan in finished:
+            skill = rng.uniform(0.4, 1.0)
+            for _ in range(rng.randint(1, 2)):
+                picks = []
+                for question, options in plan['questions']:
+                    answer = options[0] if rng.random() < skill else rng.choice(options[1:])
+                    picks.append((question, answer, answer.is_correct))
+                score = Decimal(sum(1 for *_, ok in picks if ok) * 100 / len(picks)).quantize(Decimal('0.01'))
+                finished_at = self.now - timedelta(days=rng.randint(0, 30))
+                attempts.append((
+                    QuizAttempt(
+                        user=user, quiz=plan['quiz'], completed_at=finished_at, score=score,
+                        passed=score >= plan['quiz'].passing_score,
+                        time_taken=rng.randint(300, 1800),
+                    ),
+                    plan,
+                    picks,
+                ))
+                skill = min(1.0, skill + 0.2)
+
+        saved = self._bulk(QuizAttempt, [attempt for attempt, _, _ in attempts])
+        responses = self._bulk(QuizResponse, [
+            QuizResponse(
+                attempt=attempt, question=question, graded_correct=ok,
+                points_earned=question.points if ok else 0,
+            )
+            for attempt, (_, _, picks) in zip(saved, attempts)
+            for question, _, ok in picks
+        ])
+        through = QuizResponse.selected_answers.through
+        picked_answers = (answer for _, _, picks in attempts for _, answer, _ in picks)
+        self._bulk_stream(through, (
+            through(quizresponse_id=response.pk, answer_id=answer.pk)
+            for response, answer in zip(responses, picked_answers)
+        ))
+
+        # Best passing attempt per (user, course) earns the certificate
+        best = {}
+        for attempt, plan, _ in attempts:
+            key = (attempt.user_id, plan['course'].pk)
+            if attempt.passed and (key not in best or attempt.score > best[key].score):
+                best[key] = attempt
+
+        certificates = []
+        completed_progress = []
+        for (user_id, course_id), attempt in best.items():
+            self.certificate_serial += 1
+            certificates.append(Certificate(
+                user_id=user_id, course_id=course_id, quiz_score=attempt.score,
+                certificate_id=f'BENCH{self.certificate_serial:010d}',
+            ))
+            row = progress_by_pair[(user_id, course_id)]
+            row.quiz_passed = True
+            row.is_completed = True
+            row.completed_at = attempt.completed_at
+            row.last_quiz_attempt_id = str(attempt.pk)
+            completed_progress.append(row)
+
+        self._bulk(Certificate, certificates)
+        CourseProgress.objects.bulk_update(
+            completed_progress,
+            ['quiz_passed', 'is_completed', 'completed_at', 'last_quiz_attempt_id'],
+            batch_size=self.chunk_size,
+        )
+
+    # -----------------------------
+    # Derived data
+    # -----------------------------
+    def _refresh_derived(self, courses):
+        """bulk_create skips signals, so rebuild what they would have maintained"""
+        for course in courses:
+            sync_course_skills(course)
+        refresh_search_documents(course.pk for course in courses)
+        fresh = compute_course_stats(Course.objects.filter(pk__in=[course.pk for course in courses]))
+        for course in courses:
+            for field, value in fresh[course.pk].items():
+                setattr(course, field, value)
+        Course.objects.bulk_update(courses, COUNTER_FIELDS)
+        forget_catalog_facets()
+        mark_home_snapshot_stale()
@@ -0,0 +1,176 @@
+# lms/middleware.py
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Database execute wrapper that counts queries and their total time.
+
+    Also usable on its own, e.g. in tests::
+
+        with QueryStats() as stats:
+            client.get(url)
+        stats.count, stats.duration
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of every request and log views that go over their
+    ``QUERY_BUDGETS`` entry (keyed by URL name). With ``SERVER_TIMING_HEADER``
+    on, the count and total DB time are also sent as a Server-Timing header.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryStats() as stats:
+            response = self.get_response(request)
+        return self._check_budget(request, response, stats)
+
+    async def __acall__(self, request):
+        # Database connections are per thread, so a wrapper installed on the
+        # event loop never sees a query. Under ASGI the request's sync code
+        # (sync views, async ORM calls, anything via thread-sensitive
+        # sync_to_async) all runs in one thread: install the wrapper there.
+        stats = QueryStats()
+        await sync_to_async(stats.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stats.__exit__)(None, None, None)
+        return self._check_budget(request, response, stats)
+
+    def _check_budget(self, request, response, stats):
+        match = request.resolver_match
+        url_name = match.url_name if match else None
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(url_name)
+        if budget is not None and stats.count > budget:
+            logger.warning(
+                "%s ran %d queries (budget %d, %.1fms in the database): %s",
+                url_name, stats.count, budget, stats.duration_ms, request.path,
+            )
+
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            timing = f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"'
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+
+        return response
+
+
+class SessionRefreshMiddleware:
+    """
+    Sliding session expiry without a write on every request.
+
+    With SESSION_SAVE_EVERY_REQUEST off, sessions are only saved when they
+    change. This touches a timestamp in the session once it is older than
+    SESSION_REFRESH_FRACTION of SESSION_COOKIE_AGE, which saves the session
+    and pushes its expiry (and the cookie's) forward. Must come after
+    SessionMiddleware.
+    """
+    KEY = '_refreshed_at'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._refresh(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Reading the session may load it from the cache or database
+        await sync_to_async(self._refresh)(request)
+        return response
+
+    def _refresh(self, request):
+        session = getattr(request, 'session', None)
+        # Never create a session just to refresh it
+        if session is None or session.is_empty():
+            return
+
+        now = int(time.time())
+        max_age = settings.SESSION_COOKIE_AGE * getattr(settings, 'SESSION_REFRESH_FRACTION', 0.1)
+        if session.modified or now - session.get(self.KEY, 0) > max_age:
+            session[self.KEY] = now
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI.
+
+    WhiteNoise's middleware is sync-only, which makes Django wrap the whole
+    rest of the stack in a thread hop on every request. The static file
+    lookup is an in-memory dict read, so it can be done on the event loop
+    and only non-static requests go on to the async handler.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Development only: scans the finders on disk
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
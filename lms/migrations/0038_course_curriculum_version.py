@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0037_certificate_generated_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='curriculum_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
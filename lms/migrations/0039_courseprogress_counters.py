@@ -0,0 +1,61 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    CourseProgress = apps.get_model('lms', 'CourseProgress')
+    Video = apps.get_model('lms', 'Video')
+
+    totals = dict(
+        Video.objects.values('curriculum_day__course_id')
+        .annotate(total=Count('id'))
+        .values_list('curriculum_day__course_id', 'total')
+    )
+
+    batch = []
+    for progress in CourseProgress.objects.annotate(
+        completed=Count('completed_videos')
+    ).iterator(chunk_size=500):
+        progress.completed_count = progress.completed
+        progress.total_count = totals.get(progress.course_id, 0)
+        if progress.total_count:
+            progress.progress_percentage = (
+                Decimal(progress.completed_count) * 100 / progress.total_count
+            ).quantize(Decimal('0.01'))
+        batch.append(progress)
+
+        if len(batch) >= 500:
+            CourseProgress.objects.bulk_update(
+                batch, ['completed_count', 'total_count', 'progress_percentage']
+            )
+            batch = []
+
+    if batch:
+        CourseProgress.objects.bulk_update(
+            batch, ['completed_count', 'total_count', 'progress_percentage']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0038_course_curriculum_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courseprogress',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='courseprogress',
+            name='total_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
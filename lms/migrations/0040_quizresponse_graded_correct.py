@@ -0,0 +1,71 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+def grade_existing_responses(apps, schema_editor):
+    Question = apps.get_model('lms', 'Question')
+    Answer = apps.get_model('lms', 'Answer')
+    QuizResponse = apps.get_model('lms', 'QuizResponse')
+    Through = QuizResponse.selected_answers.through
+
+    questions = {
+        question_id: (question_type, points)
+        for question_id, question_type, points in Question.objects.values_list(
+            'id', 'question_type', 'points'
+        )
+    }
+    correct = {}
+    for question_id, answer_id in Answer.objects.filter(
+        is_correct=True
+    ).values_list('question_id', 'id'):
+        correct.setdefault(question_id, set()).add(answer_id)
+
+    selected = {}
+    for response_id, answer_id in Through.objects.values_list('quizresponse_id', 'answer_id'):
+        selected.setdefault(response_id, set()).add(answer_id)
+
+    batch = []
+    for response in QuizResponse.objects.only('id', 'question_id').iterator(chunk_size=1000):
+        question_type, points = questions.get(response.question_id, (None, 0))
+        answers = selected.get(response.id, set())
+        expected = correct.get(response.question_id, set())
+
+        if question_type in ('single', 'true_false'):
+            is_correct = len(answers) == 1 and answers == expected
+        elif question_type == 'multiple':
+            is_correct = answers == expected
+        else:
+            is_correct = False
+
+        response.graded_correct = is_correct
+        response.points_earned = points if is_correct else 0
+        batch.append(response)
+
+        if len(batch) >= 1000:
+            QuizResponse.objects.bulk_update(batch, ['graded_correct', 'points_earned'])
+            batch = []
+
+    if batch:
+        QuizResponse.objects.bulk_update(batch, ['graded_correct', 'points_earned'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0039_courseprogress_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizresponse',
+            name='graded_correct',
+            field=models.BooleanField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizresponse',
+            name='points_earned',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(grade_existing_responses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0040_quizresponse_graded_correct'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='course_catalog_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+def fill_search_documents(apps, schema_editor):
+    Course = apps.get_model('lms', 'Course')
+
+    courses = list(Course.objects.select_related('category').prefetch_related('instructors'))
+    for course in courses:
+        parts = [
+            course.short_description,
+            course.tagline,
+            (course.skills or '').replace(',', ' '),
+            (course.tools_learned or '').replace(',', ' '),
+        ]
+        if course.category_id:
+            parts.append(course.category.name)
+        parts.extend(instructor.name for instructor in course.instructors.all())
+        course.search_document = ' '.join(part for part in parts if part)
+
+    Course.objects.bulk_update(courses, ['search_document'], batch_size=500)
+
+
+def add_search_vector(apps, schema_editor):
+    # Postgres only: SQLite falls back to the in-memory index in lms/search.py
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        ALTER TABLE lms_course ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(search_document, '')), 'B')
+        ) STORED
+    """)
+    schema_editor.execute(
+        "CREATE INDEX course_search_vector_idx ON lms_course USING GIN (search_vector)"
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS course_search_vector_idx")
+    schema_editor.execute("ALTER TABLE lms_course DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0041_course_catalog_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
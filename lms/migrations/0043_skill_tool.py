@@ -0,0 +1,170 @@
+# Generated by Django 6.0.1 on 2026-10-17 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Icon maps as of this migration (Course.SKILL_ICON_MAP / TOOL_ICON_MAP)
+SKILL_ICON_MAP = {
+    'python': 'fab fa-python',
+    'django': 'fab fa-python',
+    'flask': 'fas fa-flask',
+    'react': 'fab fa-react',
+    'javascript': 'fab fa-js-square',
+    'html': 'fab fa-html5',
+    'css': 'fab fa-css3-alt',
+    'git': 'fab fa-git-alt',
+    'github': 'fab fa-github',
+    'docker': 'fab fa-docker',
+    'aws': 'fab fa-aws',
+    'database': 'fas fa-database',
+    'sql': 'fas fa-database',
+    'mongodb': 'fas fa-database',
+    'rest api': 'fas fa-code',
+    'testing': 'fas fa-vial',
+    'security': 'fas fa-shield-alt',
+    'devops': 'fas fa-server',
+    'ui': 'fas fa-paint-brush',
+    'ux': 'fas fa-user-friends',
+    'figma': 'fab fa-figma',
+}
+
+TOOL_ICON_MAP = {
+    'vscode': 'fas fa-code',
+    'visual studio code': 'fas fa-code',
+    'github': 'fab fa-github',
+    'git': 'fab fa-git-alt',
+    'postman': 'fas fa-code',
+    'docker': 'fab fa-docker',
+    'jenkins': 'fas fa-cog',
+    'aws': 'fab fa-aws',
+    'figma': 'fab fa-figma',
+    'notion': 'fas fa-sticky-note',
+    'jira': 'fab fa-jira',
+    'slack': 'fab fa-slack',
+}
+
+
+def split_names(text):
+    names = []
+    seen = set()
+    for part in (text or '').split(','):
+        name = part.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def copy_skills_and_tools(apps, schema_editor):
+    Course = apps.get_model('lms', 'Course')
+    Skill = apps.get_model('lms', 'Skill')
+    Tool = apps.get_model('lms', 'Tool')
+    CourseSkillLink = apps.get_model('lms', 'CourseSkillLink')
+    CourseToolLink = apps.get_model('lms', 'CourseToolLink')
+
+    skills = {}
+    tools = {}
+    skill_links = []
+    tool_links = []
+
+    # Oldest course first, so a shared skill keeps the spelling it was created with
+    rows = Course.objects.order_by('id').values_list('id', 'skills', 'tools_learned')
+    for course_id, skills_text, tools_text in rows:
+        for position, name in enumerate(split_names(skills_text)):
+            key = name.lower()
+            if key not in skills:
+                skills[key] = Skill(key=key, name=name, icon=SKILL_ICON_MAP.get(key, 'fas fa-code'))
+            skill_links.append((course_id, key, position))
+
+        for position, name in enumerate(split_names(tools_text)):
+            key = name.lower()
+            if key not in tools:
+                tools[key] = Tool(key=key, name=name, icon=TOOL_ICON_MAP.get(key, 'fas fa-toolbox'))
+            tool_links.append((course_id, key, position))
+
+    Skill.objects.bulk_create(skills.values(), batch_size=500)
+    Tool.objects.bulk_create(tools.values(), batch_size=500)
+
+    skill_ids = dict(Skill.objects.values_list('key', 'id'))
+    tool_ids = dict(Tool.objects.values_list('key', 'id'))
+
+    CourseSkillLink.objects.bulk_create([
+        CourseSkillLink(course_id=course_id, skill_id=skill_ids[key], position=position)
+        for course_id, key, position in skill_links
+    ], batch_size=500)
+    CourseToolLink.objects.bulk_create([
+        CourseToolLink(course_id=course_id, tool_id=tool_ids[key], position=position)
+        for course_id, key, position in tool_links
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0042_course_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('icon', models.CharField(default='fas fa-code', max_length=50)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tool',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('icon', models.CharField(default='fas fa-toolbox', max_length=50)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseSkillLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='lms.course')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_links', to='lms.skill')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('course', 'skill')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseToolLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tool_links', to='lms.course')),
+                ('tool', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_links', to='lms.tool')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('course', 'tool')},
+            },
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='courses', through='lms.CourseSkillLink', to='lms.skill'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='tool_tags',
+            field=models.ManyToManyField(blank=True, related_name='courses', through='lms.CourseToolLink', to='lms.tool'),
+        ),
+        migrations.RunPython(copy_skills_and_tools, migrations.RunPython.noop),
+    ]
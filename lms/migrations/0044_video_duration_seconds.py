@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:30
+
+from django.db import migrations, models
+
+
+def parse_duration(value):
+    if not value:
+        return 0
+    try:
+        seconds = 0
+        for part in str(value).strip().split(':'):
+            seconds = seconds * 60 + int(float(part))
+        return max(seconds, 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+def fill_duration_seconds(apps, schema_editor):
+    Video = apps.get_model('lms', 'Video')
+
+    videos = list(Video.objects.only('id', 'duration'))
+    for video in videos:
+        video.duration_seconds = parse_duration(video.duration)
+    Video.objects.bulk_update(videos, ['duration_seconds'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0043_skill_tool'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_duration_seconds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-17 13:05
+
+import re
+
+from django.db import migrations, models
+
+
+YOUTUBE_ID_RE = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?'
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|embed/|v/|shorts/)|youtu\.be/)'
+    r'([\w\-]{11})(?![\w\-])',
+    re.IGNORECASE
+)
+VIMEO_ID_RE = re.compile(r'vimeo\.com/(?:video/)?(\d+)', re.IGNORECASE)
+
+
+def parse_video_url(url):
+    url = str(url or '').strip()
+    if not url:
+        return '', '', ''
+    match = YOUTUBE_ID_RE.search(url)
+    if match:
+        return 'youtube', match.group(1), f"https://www.youtube.com/embed/{match.group(1)}"
+    match = VIMEO_ID_RE.search(url)
+    if match:
+        return 'vimeo', match.group(1), f"https://player.vimeo.com/video/{match.group(1)}"
+    return '', '', url
+
+
+def fill_embed_metadata(apps, schema_editor):
+    Video = apps.get_model('lms', 'Video')
+
+    videos = list(Video.objects.only('id', 'video_url'))
+    for video in videos:
+        video.provider, video.provider_video_id, video.resolved_embed_url = parse_video_url(video.video_url)
+    Video.objects.bulk_update(
+        videos, ['provider', 'provider_video_id', 'resolved_embed_url'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0044_video_duration_seconds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='provider',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='provider_video_id',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='resolved_embed_url',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['provider', 'provider_video_id'], name='video_provider_idx'),
+        ),
+        migrations.RunPython(fill_embed_metadata, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:05
+
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    Course = apps.get_model('lms', 'Course')
+    CourseEnrollment = apps.get_model('lms', 'CourseEnrollment')
+    CourseReview = apps.get_model('lms', 'CourseReview')
+    Purchase = apps.get_model('lms', 'Purchase')
+
+    # A learner has an enrollment or a completed purchase (or both)
+    learners = {}
+    for user_id, course_id in CourseEnrollment.objects.values_list('user_id', 'course_id'):
+        learners.setdefault(course_id, set()).add(user_id)
+    for user_id, course_id in Purchase.objects.filter(
+        payment_status='completed'
+    ).values_list('user_id', 'course_id'):
+        learners.setdefault(course_id, set()).add(user_id)
+
+    ratings = {}
+    for course_id, rating, count in CourseReview.objects.values_list(
+        'course_id', 'rating'
+    ).annotate(n=models.Count('id')).order_by():
+        ratings.setdefault(course_id, {})[rating] = count
+
+    courses = list(Course.objects.only('id'))
+    for course in courses:
+        by_stars = ratings.get(course.id, {})
+        course.learner_count = len(learners.get(course.id, ()))
+        course.rating_count = sum(by_stars.values())
+        course.rating_sum = sum(stars * count for stars, count in by_stars.items())
+        for stars in range(1, 6):
+            setattr(course, f'rating_{stars}', by_stars.get(stars, 0))
+
+    Course.objects.bulk_update(courses, [
+        'learner_count', 'rating_count', 'rating_sum',
+        'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5',
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0045_video_embed_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='learner_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
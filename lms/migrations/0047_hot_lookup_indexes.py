@@ -0,0 +1,61 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0046_course_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', '-is_featured', '-created_at'], name='course_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(
+                condition=models.Q(('payment_status', 'completed')),
+                fields=['user', '-purchased_at'],
+                name='purchase_user_completed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(
+                condition=models.Q(('payment_status', 'completed')),
+                fields=['course'],
+                name='purchase_course_completed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='uservideoprogress',
+            index=models.Index(
+                condition=models.Q(('is_completed', True)),
+                fields=['user', 'video'],
+                name='uvp_user_completed_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='coursereview',
+            index=models.Index(fields=['course', '-created_at', '-id'], name='review_course_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', 'status', '-payment_date'], name='payment_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'quiz', '-started_at'], name='quizattempt_user_quiz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(
+                condition=models.Q(('passed', True)),
+                fields=['user', 'quiz', '-score'],
+                name='quizattempt_passed_idx',
+            ),
+        ),
+    ]
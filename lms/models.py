@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.conf import settings
 from ckeditor.fields import RichTextField
 from django.utils import timezone
+import re
 import uuid
 
 from urllib3 import request
@@ -226,6 +227,20 @@ class Course(models.Model):
         related_name='courses'
     )
 
+    skill_tags = models.ManyToManyField(
+        'Skill',
+        through='CourseSkillLink',
+        related_name='courses',
+        blank=True
+    )
+
+    tool_tags = models.ManyToManyField(
+        'Tool',
+        through='CourseToolLink',
+        related_name='courses',
+        blank=True
+    )
+
     # =========================
     # PRICING
     # =========================
@@ -313,6 +328,26 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Bumped by signals whenever the curriculum changes (see lms/curriculum.py)
+    curriculum_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # Denormalized text for course search, maintained by signals (see lms/search.py)
+    search_document = models.TextField(blank=True, default='', editable=False)
+
+    # =========================
+    # COUNTERS (see lms/stats.py)
+    # =========================
+    # Maintained with F() updates from Purchase / CourseEnrollment /
+    # CourseReview signals; `manage.py reconcile_course_stats` repairs them.
+    learner_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+
     # =========================
     # ICON MAPPINGS (CLASS ATTRIBUTES)
     # =========================
@@ -361,6 +396,22 @@ class Course(models.Model):
         ordering = ['-created_at']
         verbose_name = "Course"
         verbose_name_plural = "Courses"
+        indexes = [
+            # Keyset pagination of the catalog (see lms/catalog.py)
+            models.Index(fields=['is_active', '-created_at', '-id'], name='course_catalog_idx'),
+            # Home page: featured courses first, then the newest
+            models.Index(fields=['is_active', '-is_featured', '-created_at'], name='course_featured_idx'),
+        ]
+
+    # Only ever written with F() updates (see lms/curriculum.py and
+    # lms/stats.py). A full save() of a stale instance leaves them alone
+    # instead of writing old values back; name them in update_fields to
+    # write them on purpose.
+    DB_MAINTAINED_FIELDS = frozenset({
+        'curriculum_version',
+        'learner_count', 'rating_count', 'rating_sum',
+        'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5',
+    })
 
     def __str__(self):
         return self.title
@@ -368,6 +419,17 @@ class Course(models.Model):
     def get_absolute_url(self):
         return reverse('course_detail', kwargs={'slug': self.slug})
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.DB_MAINTAINED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     # =========================
     # HELPERS
     # =========================
@@ -379,11 +441,30 @@ class Course(models.Model):
             )
         return 0
 
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return 0
+        return round(self.rating_sum / self.rating_count, 1)
+
+    @property
+    def rating_histogram(self):
+        """[(stars, count, percentage)] from 5 stars down to 1"""
+        histogram = []
+        for stars in range(5, 0, -1):
+            count = getattr(self, f'rating_{stars}')
+            percentage = round(count * 100 / self.rating_count) if self.rating_count else 0
+            histogram.append((stars, count, percentage))
+        return histogram
+
+    # Normalized copies of ``skills`` / ``tools_learned``, synced on save
+    # (see lms/skills.py). Prefetch ``skill_links__skill`` and
+    # ``tool_links__tool`` to render them without extra queries.
     def get_skills_list(self):
-        return [s.strip() for s in self.skills.split(',') if s.strip()]
+        return [link.skill.name for link in self.skill_links.all()]
 
     def get_tools_list(self):
-        return [t.strip() for t in self.tools_learned.split(',') if t.strip()]
+        return [link.tool.name for link in self.tool_links.all()]
 
     # =========================
     # NEW ICON METHODS
@@ -399,28 +480,79 @@ class Course(models.Model):
         return self.TOOL_ICON_MAP.get(tool_lower, 'fas fa-toolbox')
 
     def get_skills_with_icons(self):
-        """Return list of skills with their icons"""
-        skills_list = self.get_skills_list()
+        """Return list of skills with their icons (resolved when the skill was created)"""
         return [
             {
-                'name': skill,
-                'icon': self.get_skill_icon(skill)
+                'name': link.skill.name,
+                'icon': link.skill.icon
             }
-            for skill in skills_list
+            for link in self.skill_links.all()
         ]
 
     def get_tools_with_icons(self):
-        """Return list of tools with their icons"""
-        tools_list = self.get_tools_list()
+        """Return list of tools with their icons (resolved when the tool was created)"""
         return [
             {
-                'name': tool,
-                'icon': self.get_tool_icon(tool)
+                'name': link.tool.name,
+                'icon': link.tool.icon
             }
-            for tool in tools_list
+            for link in self.tool_links.all()
         ]
 
 
+# ============================
+# SKILLS & TOOLS
+# ============================
+class Skill(models.Model):
+    name = models.CharField(max_length=100)
+    # Lowercased name, used for lookups and the ?skill= catalog filter
+    key = models.CharField(max_length=100, unique=True)
+    icon = models.CharField(max_length=50, default='fas fa-code')
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class Tool(models.Model):
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+    icon = models.CharField(max_length=50, default='fas fa-toolbox')
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class CourseSkillLink(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='course_links')
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        unique_together = ['course', 'skill']
+
+    def __str__(self):
+        return f"{self.course_id} - {self.skill.name}"
+
+
+class CourseToolLink(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='tool_links')
+    tool = models.ForeignKey(Tool, on_delete=models.CASCADE, related_name='course_links')
+    position = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        unique_together = ['course', 'tool']
+
+    def __str__(self):
+        return f"{self.course_id} - {self.tool.name}"
+
 
 # ============================
 # COURSE TOOL (Legacy - for backward compatibility)
@@ -467,6 +599,64 @@ from django.db import models
 from django.conf import settings
 from .models import CurriculumDay  # Make sure Purchase and CurriculumDay are imported
 
+
+def parse_duration(value):
+    """Convert "SS", "MM:SS" or "HH:MM:SS" into seconds (0 if it can't be parsed)"""
+    if not value:
+        return 0
+    try:
+        seconds = 0
+        for part in str(value).strip().split(':'):
+            seconds = seconds * 60 + int(float(part))
+        return max(seconds, 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+VIDEO_PROVIDER_YOUTUBE = 'youtube'
+VIDEO_PROVIDER_VIMEO = 'vimeo'
+
+YOUTUBE_ID_RE = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?'
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|embed/|v/|shorts/)|youtu\.be/)'
+    r'([\w\-]{11})(?![\w\-])',
+    re.IGNORECASE
+)
+VIMEO_ID_RE = re.compile(r'vimeo\.com/(?:video/)?(\d+)', re.IGNORECASE)
+
+
+def parse_video_url(url):
+    """
+    Return (provider, provider_video_id, embed_url) for a video URL.
+    Unknown hosts keep the URL itself as the embed URL.
+    """
+    url = str(url or '').strip()
+    if not url:
+        return '', '', ''
+
+    match = YOUTUBE_ID_RE.search(url)
+    if match:
+        video_id = match.group(1)
+        return VIDEO_PROVIDER_YOUTUBE, video_id, f"https://www.youtube.com/embed/{video_id}"
+
+    match = VIMEO_ID_RE.search(url)
+    if match:
+        video_id = match.group(1)
+        return VIDEO_PROVIDER_VIMEO, video_id, f"https://player.vimeo.com/video/{video_id}"
+
+    return '', '', url
+
+
+def format_duration(seconds):
+    """Format seconds as "M:SS" or "H:MM:SS" for display"""
+    seconds = int(seconds or 0)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
 class Video(models.Model):
     """Model for course videos"""
     curriculum_day = models.ForeignKey(
@@ -479,6 +669,12 @@ class Video(models.Model):
     video_url = models.URLField(help_text="URL to video file or embed link")
     video_file = models.FileField(upload_to='course_videos/', blank=True, null=True)
     duration = models.CharField(max_length=10, help_text="Format: MM:SS or HH:MM:SS")
+    # Parsed from ``duration`` on save
+    duration_seconds = models.PositiveIntegerField(default=0, editable=False)
+    # Extracted from ``video_url`` on save (see parse_video_url)
+    provider = models.CharField(max_length=20, blank=True, default='', editable=False)
+    provider_video_id = models.CharField(max_length=50, blank=True, default='', editable=False)
+    resolved_embed_url = models.CharField(max_length=500, blank=True, default='', editable=False)
     thumbnail = models.ImageField(upload_to='video_thumbnails/', blank=True, null=True)
     order = models.IntegerField(default=0)
     is_free = models.BooleanField(default=False)
@@ -486,108 +682,61 @@ class Video(models.Model):
     def __str__(self):
         return f"{self.curriculum_day} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        self.duration_seconds = parse_duration(self.duration)
+        self.provider, self.provider_video_id, self.resolved_embed_url = parse_video_url(self.video_url)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'duration' in update_fields:
+                update_fields.add('duration_seconds')
+            if 'video_url' in update_fields:
+                update_fields |= {'provider', 'provider_video_id', 'resolved_embed_url'}
+            kwargs['update_fields'] = update_fields
+
+        super().save(*args, **kwargs)
+
     # -----------------------------
     # Video URL helpers
     # -----------------------------
     def get_youtube_id(self):
-        """Extract YouTube video ID from URL"""
-        if not self.video_url:
-            return None
-        
-        import re
-        from urllib.parse import urlsplit, parse_qs
-
-        url = str(self.video_url).strip()
-        patterns = [
-            r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=([\w\-]{11})',
-            r'(?:https?:\/\/)?(?:www\.)?youtu\.be\/([\w\-]{11})',
-            r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([\w\-]{11})',
-            r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/v\/([\w\-]{11})',
-            r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/([\w\-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
-            if match:
-                video_id = match.group(1)
-                if len(video_id) == 11 and re.match(r'^[\w\-]+$', video_id):
-                    return video_id
-        
-        # Fallback parsing
-        try:
-            parsed = urlsplit(url)
-            if parsed.netloc in ['youtu.be', 'www.youtu.be']:
-                video_id = parsed.path.strip('/').split('?')[0]
-                if len(video_id) == 11:
-                    return video_id
-            if 'youtube.com' in parsed.netloc:
-                if parsed.path.startswith('/watch'):
-                    query_params = parse_qs(parsed.query)
-                    if 'v' in query_params:
-                        video_id = query_params['v'][0]
-                        if len(video_id) == 11:
-                            return video_id
-                elif parsed.path.startswith(('/embed/', '/v/', '/shorts/')):
-                    video_id = parsed.path.split('/')[2]
-                    if len(video_id) == 11:
-                        return video_id
-        except Exception:
-            pass
-        
-        return None
+        """YouTube video ID (extracted on save)"""
+        provider, video_id, _ = self._embed_metadata()
+        return video_id if provider == VIDEO_PROVIDER_YOUTUBE else None
 
     def get_vimeo_id(self):
-        """Extract Vimeo video ID from URL"""
-        if not self.video_url:
-            return None
-        
-        import re
-        match = re.search(r'vimeo\.com\/(\d+)', self.video_url)
-        if match:
-            return match.group(1)
-        return None
+        """Vimeo video ID (extracted on save)"""
+        provider, video_id, _ = self._embed_metadata()
+        return video_id if provider == VIDEO_PROVIDER_VIMEO else None
 
     def get_embed_url(self):
         """Get embed URL for the video"""
-        youtube_id = self.get_youtube_id()
-        if youtube_id:
-            return f"https://www.youtube.com/embed/{youtube_id}"
-        
-        vimeo_id = self.get_vimeo_id()
-        if vimeo_id:
-            return f"https://player.vimeo.com/video/{vimeo_id}"
-        
-        return self.video_url
+        return self._embed_metadata()[2]
+
+    def _embed_metadata(self):
+        # Stored values, or a one-off parse for instances not saved since video_url was set
+        if self.resolved_embed_url or not self.video_url:
+            return self.provider, self.provider_video_id, self.resolved_embed_url or self.video_url
+        return parse_video_url(self.video_url)
 
     # -----------------------------
     # Access control
     # -----------------------------
-    def is_accessible_by(self, user):
-        from .models import Purchase
+    def is_accessible_by(self, user, access=None):
         """
         Access rules:
         - Day 1 videos are free for everyone
         - Day 2+ videos require purchase
         - Free videos are always accessible
-        """
-        # Free video or free curriculum day
-        if self.is_free or self.curriculum_day.is_free:
-            return True
-
-        # Day 1 is free for all users
-        if self.curriculum_day.day_number == 1:
-            return True
-
-        # Day 2+ requires purchase
-        if user.is_authenticated:
-            return Purchase.objects.filter(
-                user=user,
-                course=self.curriculum_day.course,
-                payment_status='completed'
-            ).exists()
 
-        # Not logged in and Day 2+
-        return False
+        When checking many videos of one course, build a single
+        ``CourseAccess`` and pass it in as ``access``.
+        """
+        if access is None:
+            from .access import CourseAccess
+            access = CourseAccess(user, self.curriculum_day.course)
+        return access.can_access_video(self)
    
     @property
     def youtube_id(self):
@@ -618,6 +767,9 @@ class Video(models.Model):
         verbose_name = "Video"
         verbose_name_plural = "Videos"
         ordering = ['order', 'id']
+        indexes = [
+            models.Index(fields=['provider', 'provider_video_id'], name='video_provider_idx'),
+        ]
 
 
 
@@ -675,6 +827,19 @@ class Purchase(models.Model):
         verbose_name_plural = "Purchases"
         ordering = ['-purchased_at']
         unique_together = ['user', 'course']
+        indexes = [
+            # "My courses" and learner counts only ever look at completed purchases
+            models.Index(
+                fields=['user', '-purchased_at'],
+                condition=models.Q(payment_status='completed'),
+                name='purchase_user_completed_idx',
+            ),
+            models.Index(
+                fields=['course'],
+                condition=models.Q(payment_status='completed'),
+                name='purchase_course_completed_idx',
+            ),
+        ]
 
 
 
@@ -703,26 +868,35 @@ class UserVideoProgress(models.Model):
 
     class Meta:
         unique_together = ('user', 'video')
+        indexes = [
+            # Completed-video lookups per user (progress pages, certificates)
+            models.Index(
+                fields=['user', 'video'],
+                condition=models.Q(is_completed=True),
+                name='uvp_user_completed_idx',
+            ),
+        ]
         verbose_name = "User Video Progress"
         verbose_name_plural = "User Video Progress"
 
     def save(self, *args, **kwargs):
         """Update watched_percentage before saving"""
-        if self.video and self.video.duration:
-            try:
-                # Calculate percentage
-                video_duration = float(self.video.duration)
-                if video_duration > 0:
-                    percentage = (float(self.watched_duration) / video_duration) * 100
-                    # Cap at 100%
-                    self.watched_percentage = min(percentage, 100)
-                    
-                    # Auto-mark as completed if watched >= 95%
-                    if not self.is_completed and self.watched_percentage >= 95:
-                        self.is_completed = True
-            except (ValueError, TypeError):
-                # Keep existing percentage if calculation fails
-                pass
+        # Use the loaded video if there is one, otherwise read just the column
+        if UserVideoProgress.video.is_cached(self):
+            video_duration = self.video.duration_seconds
+        else:
+            video_duration = Video.objects.filter(
+                pk=self.video_id
+            ).values_list('duration_seconds', flat=True).first() or 0
+        
+        if video_duration > 0:
+            percentage = int(self.watched_duration * 100 / video_duration)
+            # Cap at 100%
+            self.watched_percentage = min(percentage, 100)
+            
+            # Auto-mark as completed if watched >= 95%
+            if not self.is_completed and self.watched_percentage >= 95:
+                self.is_completed = True
         
         super().save(*args, **kwargs)
     
@@ -779,6 +953,10 @@ class CourseReview(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Course Review'
         verbose_name_plural = 'Course Reviews'
+        indexes = [
+            # Keyset pagination of a course's reviews (see lms/reviews.py)
+            models.Index(fields=['course', '-created_at', '-id'], name='review_course_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.course.title} ({self.rating}★)"
@@ -864,6 +1042,12 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Latest successful payment of a user
+            models.Index(fields=['user', 'status', '-payment_date'], name='payment_user_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.email} - {self.course.title} - ₹{self.amount}"
     
@@ -957,6 +1141,10 @@ class CourseProgress(models.Model):
     quiz_passed = models.BooleanField(default=False)
     last_quiz_attempt_id = models.CharField(max_length=100, blank=True, null=True, help_text="ID of the quiz attempt that passed")
     
+    # Denormalized counters, kept in sync by record_completed_video()
+    completed_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+    
     
     class Meta:
         unique_together = ['user', 'course']
@@ -965,17 +1153,80 @@ class CourseProgress(models.Model):
     def __str__(self):
         return f"{self.user.email} - {self.course.title} ({self.progress_percentage}%)"
     
+    @staticmethod
+    def percentage(completed, total):
+        """progress_percentage for completed out of total videos, capped at 100"""
+        from decimal import Decimal
+        
+        if not total:
+            return Decimal('0.00')
+        return min(Decimal(completed) * 100 / total, Decimal(100)).quantize(Decimal('0.01'))
+    
+    @staticmethod
+    def percentage_expression(completed, total):
+        """percentage() as a database expression, for set-based updates"""
+        from django.db.models import Case, DecimalField, ExpressionWrapper, FloatField, Value, When
+        from django.db.models.functions import Cast, Least
+        from django.db.models.lookups import GreaterThan
+        from decimal import Decimal
+        
+        output_field = DecimalField(max_digits=5, decimal_places=2)
+        # Float division: SQLite would divide two integers as integers
+        share = ExpressionWrapper(
+            Cast(completed, FloatField()) * Value(100.0) / total, output_field=output_field
+        )
+        return Case(
+            When(GreaterThan(total, 0), then=Least(share, Value(Decimal('100.00')))),
+            default=Value(Decimal('0.00')),
+            output_field=output_field,
+        )
+    
     def update_progress(self):
-        """Calculate and update course progress"""
-        # Get total videos count through curriculum days
-        total_videos = Video.objects.filter(
-            curriculum_day__course=self.course
-        ).count()
+        """Recount completed videos and update course progress"""
+        from .curriculum import get_course_video_total
         
-        if total_videos > 0:
-            completed = self.completed_videos.count()
-            self.progress_percentage = (completed / total_videos) * 100
-            self.save()
+        total_videos = get_course_video_total(self.course_id)
+        self.total_count = total_videos
+        self.completed_count = self.completed_videos.count()
+        self.progress_percentage = self.percentage(self.completed_count, total_videos)
+        self.save()
+    
+    def record_completed_video(self, video):
+        """
+        Add a video to completed_videos and bump the counters atomically.
+        Returns True if the video was not completed before.
+        """
+        from django.db.models import F, Value
+        from .curriculum import get_course_video_total
+        
+        through = CourseProgress.completed_videos.through
+        _, created = through.objects.get_or_create(
+            courseprogress_id=self.pk,
+            video_id=video.pk
+        )
+        
+        total_videos = get_course_video_total(self.course_id)
+        completed = F('completed_count') + 1 if created else F('completed_count')
+        
+        updates = {
+            'total_count': total_videos,
+            'progress_percentage': self.percentage_expression(completed, Value(total_videos)),
+        }
+        if created:
+            updates['completed_count'] = completed
+        CourseProgress.objects.filter(pk=self.pk).update(**updates)
+        
+        self.refresh_from_db(fields=['completed_count', 'total_count', 'progress_percentage'])
+        return created
+    
+    @property
+    def all_videos_completed(self):
+        # The course's current total, not total_count: videos may have been
+        # added since this row was last updated
+        from .curriculum import get_course_video_total
+        
+        total_videos = get_course_video_total(self.course_id)
+        return total_videos > 0 and self.completed_count >= total_videos
     
     def has_passed_quiz_actually(self):
         """
@@ -989,52 +1240,62 @@ class CourseProgress(models.Model):
             return False
             
         try:
-            from .models import QuizAttempt  # Import here to avoid circular import
-            attempt = QuizAttempt.objects.get(
-                id=self.last_quiz_attempt_id,
-                user=self.user,
-                quiz__course=self.course,
-                passed=True,
-                completed_at__isnull=False  # Must be completed
-            )
-            return True
-        except (QuizAttempt.DoesNotExist, ValueError):
+            attempt = self.get_last_quiz_attempt()
+        except ValueError:
             return False
+        return (
+            attempt is not None
+            and attempt.user_id == self.user_id
+            and attempt.quiz.course_id == self.course_id
+            and attempt.passed
+            and attempt.completed_at is not None  # Must be completed
+        )
+    
+    def get_last_quiz_attempt(self):
+        """
+        The attempt named by last_quiz_attempt_id (None if it doesn't exist).
+        Kept on the instance: validation, completion and the certificate all
+        look at the same attempt while one request saves this progress.
+        """
+        attempt = getattr(self, '_last_quiz_attempt', None)
+        if attempt is None or str(attempt.id) != str(self.last_quiz_attempt_id):
+            from .models import QuizAttempt  # Import here to avoid circular import
+            attempt = QuizAttempt.objects.select_related('quiz').filter(id=self.last_quiz_attempt_id).first()
+            self._last_quiz_attempt = attempt
+        return attempt
     
     def check_completion(self):
         """Check if course is fully completed (all videos + quiz passed)"""
-        # Get total videos count through curriculum days
-        total_videos = Video.objects.filter(
-            curriculum_day__course=self.course
-        ).count()
-        
-        completed_videos = self.completed_videos.count()
-        
         # Only mark as completed if:
         # 1. All videos are completed
         # 2. Quiz is actually passed (not just flagged)
         # 3. Not already marked as completed
-        if total_videos > 0:
-            videos_completed = completed_videos == total_videos
-            quiz_actually_passed = self.has_passed_quiz_actually()
+        if self.is_completed or not self.all_videos_completed:
+            return False
+        
+        # The counters are only a fast pre-check; a certificate is issued on
+        # an exact count of the course's videos
+        completed_videos = self.completed_videos.filter(curriculum_day__course_id=self.course_id).count()
+        if completed_videos < Video.objects.filter(curriculum_day__course_id=self.course_id).count():
+            return False
+        
+        if self.has_passed_quiz_actually():
+            self.is_completed = True
+            self.completed_at = timezone.now()
+            self.save()
             
-            if videos_completed and quiz_actually_passed and not self.is_completed:
-                self.is_completed = True
-                self.completed_at = timezone.now()
-                self.save()
-                
-                # Generate certificate
-                from .models import Certificate
-                Certificate.objects.get_or_create(
-                    user=self.user,
-                    course=self.course,
-                    defaults={
-                        'issue_date': timezone.now(),
-                        'certificate_id': uuid.uuid4().hex[:12].upper(),
-                        'quiz_score': self.get_quiz_score()  # Store actual quiz score
-                    }
-                )
-                return True
+            # Generate certificate
+            from .models import Certificate
+            Certificate.objects.get_or_create(
+                user_id=self.user_id,
+                course_id=self.course_id,
+                defaults={
+                    'issue_date': timezone.now(),
+                    'certificate_id': uuid.uuid4().hex[:12].upper(),
+                    'quiz_score': self.get_quiz_score()  # Store actual quiz score
+                }
+            )
+            return True
         return False
     
     def get_quiz_score(self):
@@ -1042,12 +1303,8 @@ class CourseProgress(models.Model):
         if not self.last_quiz_attempt_id:
             return None
             
-        try:
-            from .models import QuizAttempt
-            attempt = QuizAttempt.objects.get(id=self.last_quiz_attempt_id)
-            return attempt.score
-        except QuizAttempt.DoesNotExist:
-            return None
+        attempt = self.get_last_quiz_attempt()
+        return attempt.score if attempt is not None else None
     
     def mark_quiz_passed(self, quiz_attempt):
         """
@@ -1062,13 +1319,14 @@ class CourseProgress(models.Model):
             return False
             
         # Verify the attempt belongs to this user and course
-        if (quiz_attempt.user != self.user or 
-            quiz_attempt.quiz.course != self.course):
+        if (quiz_attempt.user_id != self.user_id or 
+            quiz_attempt.quiz.course_id != self.course_id):
             return False
         
         # Mark quiz as passed
         self.quiz_passed = True
         self.last_quiz_attempt_id = str(quiz_attempt.id)
+        self._last_quiz_attempt = quiz_attempt
         self.save()
         
         # Check if course can now be completed
@@ -1085,18 +1343,16 @@ class CourseProgress(models.Model):
     
     def get_total_videos_count(self):
         """Helper to get total videos count"""
-        return Video.objects.filter(
-            curriculum_day__course=self.course
-        ).count()
+        return self.total_count
     
     def get_completed_videos_count(self):
         """Helper to get completed videos count"""
-        return self.completed_videos.count()
+        return self.completed_count
     
     def get_completion_requirements(self):
         """Get completion requirements status"""
-        total_videos = self.get_total_videos_count()
-        completed_videos = self.get_completed_videos_count()
+        total_videos = self.total_count
+        completed_videos = self.completed_count
         quiz_passed = self.has_passed_quiz_actually()
         
         return {
@@ -1104,7 +1360,7 @@ class CourseProgress(models.Model):
             'completed_videos': completed_videos,
             'videos_percentage': (completed_videos / total_videos * 100) if total_videos > 0 else 0,
             'quiz_passed': quiz_passed,
-            'quiz_actually_passed': self.has_passed_quiz_actually(),
+            'quiz_actually_passed': quiz_passed,
             'is_completed': self.is_completed,
             'requirements_met': {
                 'videos': completed_videos == total_videos,
@@ -1125,31 +1381,28 @@ class CourseProgress(models.Model):
         
         # If last_quiz_attempt_id is set, verify the attempt exists and is passed
         if self.last_quiz_attempt_id:
-            try:
-                from .models import QuizAttempt
-                attempt = QuizAttempt.objects.get(id=self.last_quiz_attempt_id)
-                
-                # Verify it's for the same user and course
-                if attempt.user != self.user:
-                    raise ValidationError({
-                        'last_quiz_attempt_id': 'Quiz attempt does not belong to this user'
-                    })
-                
-                if attempt.quiz.course != self.course:
-                    raise ValidationError({
-                        'last_quiz_attempt_id': 'Quiz attempt is not for this course'
-                    })
-                
-                # If quiz_passed is True but attempt is not passed, it's invalid
-                if self.quiz_passed and not attempt.passed:
-                    raise ValidationError({
-                        'quiz_passed': 'Quiz attempt is not marked as passed'
-                    })
-                    
-            except QuizAttempt.DoesNotExist:
+            attempt = self.get_last_quiz_attempt()
+            if attempt is None:
                 raise ValidationError({
                     'last_quiz_attempt_id': 'Quiz attempt does not exist'
                 })
+            
+            # Verify it's for the same user and course
+            if attempt.user_id != self.user_id:
+                raise ValidationError({
+                    'last_quiz_attempt_id': 'Quiz attempt does not belong to this user'
+                })
+            
+            if attempt.quiz.course_id != self.course_id:
+                raise ValidationError({
+                    'last_quiz_attempt_id': 'Quiz attempt is not for this course'
+                })
+            
+            # If quiz_passed is True but attempt is not passed, it's invalid
+            if self.quiz_passed and not attempt.passed:
+                raise ValidationError({
+                    'quiz_passed': 'Quiz attempt is not marked as passed'
+                })
     
     def save(self, *args, **kwargs):
         """Override save to run validation and prevent invalid states"""
@@ -1235,32 +1488,44 @@ class QuizAttempt(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            # Attempt counts and best passing score per (user, quiz)
+            models.Index(fields=['user', 'quiz', '-started_at'], name='quizattempt_user_quiz_idx'),
+            models.Index(
+                fields=['user', 'quiz', '-score'],
+                condition=models.Q(passed=True),
+                name='quizattempt_passed_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.quiz.title} - Score: {self.score}%"
 
     
-    def calculate_score(self):
-        """Calculate the score for this attempt"""
+    def calculate_score(self, selections=None):
+        """
+        Calculate the score for this attempt.
+        ``selections`` ({question_id: answer_ids}) skips reloading the stored responses.
+        """
+        from .grading import get_answer_key, load_selections
+        
         # Ensure the attempt is actually completed
         if not self.completed_at:
             raise ValueError("Cannot calculate score for incomplete attempt")
         
-        total_points = sum(q.points for q in self.quiz.questions.all())
+        answer_key = get_answer_key(self.quiz_id)
+        total_points = answer_key.total_points
         if total_points == 0:
             self.score = 0
             self.passed = False
             self.save()
             return 0
         
-        earned_points = 0
-        total_responses = self.responses.count()
-        total_questions = self.quiz.questions.count()
+        if selections is None:
+            selections = load_selections(self)
         
         # Calculate earned points
-        for response in self.responses.all():
-            if response.is_correct():
-                earned_points += response.question.points
+        earned_points = answer_key.score(selections)
         
         # Calculate percentage score
         score = (earned_points / total_points) * 100
@@ -1272,8 +1537,8 @@ class QuizAttempt(models.Model):
         if self.passed:
             from .models import CourseProgress
             progress, created = CourseProgress.objects.get_or_create(
-                user=self.user,
-                course=self.quiz.course
+                user_id=self.user_id,
+                course_id=self.quiz.course_id
             )
             
             # Use the new method to mark quiz as passed
@@ -1288,19 +1553,23 @@ class QuizResponse(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     selected_answers = models.ManyToManyField(Answer)
     
+    # Grading outcome, stored when the attempt is submitted
+    graded_correct = models.BooleanField(null=True, blank=True, editable=False)
+    points_earned = models.IntegerField(default=0, editable=False)
+    
     def __str__(self):
         return f"{self.attempt.user.email} - {self.question.question_text[:30]}"
     
     def is_correct(self):
         """Check if the response is correct"""
-        correct_answers = set(self.question.answers.filter(is_correct=True))
-        selected_answers = set(self.selected_answers.all())
+        if self.graded_correct is not None:
+            return self.graded_correct
         
-        if self.question.question_type == 'single' or self.question.question_type == 'true_false':
-            return len(selected_answers) == 1 and selected_answers == correct_answers
-        elif self.question.question_type == 'multiple':
-            return selected_answers == correct_answers
-        return False
+        from .grading import get_answer_key
+        
+        # Responses saved before grading was stored: grade on the fly
+        selected_ids = {answer.pk for answer in self.selected_answers.all()}
+        return get_answer_key(self.question.quiz_id).is_correct(self.question_id, selected_ids)
 
 
 class Certificate(models.Model):
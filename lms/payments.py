@@ -0,0 +1,181 @@
+# lms/payments.py
+import logging
+import random
+import threading
+import time
+from functools import cached_property
+
+import razorpay
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentGatewayError(Exception):
+    """The payment gateway could not complete the request"""
+
+
+class PaymentGatewayUnavailable(PaymentGatewayError):
+    """The circuit breaker is open; the gateway was not called"""
+
+
+# Failures worth retrying: the request may well succeed a moment later
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    # e.g. a proxy's HTML error page instead of the API's JSON
+    requests.exceptions.JSONDecodeError,
+    razorpay.errors.ServerError,
+    razorpay.errors.GatewayError,
+)
+
+
+# ============================
+# CIRCUIT BREAKER
+# ============================
+class CircuitBreaker:
+    """
+    Stop calling a gateway that keeps failing.
+
+    After ``threshold`` consecutive failures the breaker opens and calls fail
+    fast for ``reset_seconds``. Then one trial call is let through: success
+    closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, threshold, reset_seconds):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning("Payment gateway circuit opened after %d failures", self._failures)
+                self._opened_at = time.monotonic()
+
+
+# ============================
+# RAZORPAY
+# ============================
+class RazorpayGateway:
+    """
+    Razorpay client with a pooled keep-alive session, bounded timeouts,
+    retries with jittered backoff and a circuit breaker.
+
+    Settings are read on first use, so tests can override them before
+    the client is built (call ``reset()`` after changing them later).
+    """
+
+    @cached_property
+    def session(self):
+        session = requests.Session()
+        # Retries are done here, with backoff and the breaker, not by urllib3
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=getattr(settings, 'RAZORPAY_POOL_SIZE', 10),
+            max_retries=0,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @cached_property
+    def client(self):
+        return razorpay.Client(
+            session=self.session,
+            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+            base_url=getattr(settings, 'RAZORPAY_BASE_URL', 'https://api.razorpay.com'),
+        )
+
+    @cached_property
+    def breaker(self):
+        return CircuitBreaker(
+            getattr(settings, 'RAZORPAY_BREAKER_THRESHOLD', 5),
+            getattr(settings, 'RAZORPAY_BREAKER_RESET_SECONDS', 30),
+        )
+
+    @property
+    def timeout(self):
+        """(connect, read) seconds for every call"""
+        return (
+            getattr(settings, 'RAZORPAY_CONNECT_TIMEOUT', 3),
+            getattr(settings, 'RAZORPAY_READ_TIMEOUT', 10),
+        )
+
+    def reset(self):
+        """Drop the session, client and breaker so they are rebuilt from settings"""
+        if 'session' in self.__dict__:
+            self.session.close()
+        for name in ('session', 'client', 'breaker'):
+            self.__dict__.pop(name, None)
+
+    def _call(self, operation, func, *args):
+        if not self.breaker.allow():
+            raise PaymentGatewayUnavailable(f"Razorpay {operation} skipped: circuit open")
+
+        retries = getattr(settings, 'RAZORPAY_MAX_RETRIES', 2)
+        backoff = getattr(settings, 'RAZORPAY_RETRY_BACKOFF', 0.2)
+        for attempt in range(retries + 1):
+            try:
+                result = func(*args, timeout=self.timeout)
+            except TRANSIENT_ERRORS as error:
+                if attempt < retries:
+                    # Full jitter keeps retrying workers from arriving in lockstep
+                    delay = random.uniform(0, backoff * 2 ** attempt)
+                    logger.info(
+                        "Razorpay %s failed (%s), retry %d in %.2fs",
+                        operation, type(error).__name__, attempt + 1, delay,
+                    )
+                    time.sleep(delay)
+                    continue
+                self.breaker.record_failure()
+                raise PaymentGatewayError(f"Razorpay {operation} failed: {error}") from error
+            except razorpay.errors.BadRequestError as error:
+                # The gateway answered; our request was wrong
+                self.breaker.record_success()
+                raise PaymentGatewayError(f"Razorpay {operation} rejected: {error}") from error
+            self.breaker.record_success()
+            return result
+
+    def create_order(self, amount_paise, currency='INR'):
+        # A retried create can leave a duplicate order behind; unpaid orders
+        # are never charged and simply expire on Razorpay's side
+        return self._call('order.create', self.client.order.create, {
+            'amount': amount_paise,
+            'currency': currency,
+            'payment_capture': '1',
+        })
+
+    def verify_payment_signature(self, params):
+        """Local HMAC check; raises razorpay.errors.SignatureVerificationError"""
+        return self.client.utility.verify_payment_signature(params)
+
+
+razorpay_gateway = RazorpayGateway()
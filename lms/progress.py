@@ -0,0 +1,292 @@
+# lms/progress.py
+import atexit
+import logging
+import threading
+from collections import namedtuple
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import CourseProgress, UserVideoProgress, Video
+
+logger = logging.getLogger(__name__)
+
+
+def get_progress_map(user, course):
+    """
+    Load all of a user's video progress rows for one course in a single
+    query and return them as a dict keyed by video id.
+
+    Videos the user never opened are simply missing from the dict.
+    """
+    if not user.is_authenticated:
+        return {}
+
+    rows = UserVideoProgress.objects.filter(
+        user=user,
+        video__curriculum_day__course=course
+    )
+    return {row.video_id: row for row in rows}
+
+
+def recount_course_progress(progress):
+    """
+    Recount completed_count, total_count and progress_percentage of a
+    CourseProgress queryset from completed_videos and the course's videos,
+    in one UPDATE. For when videos or completed_videos rows go away.
+    """
+    through = CourseProgress.completed_videos.through
+    completed = through.objects.filter(
+        courseprogress_id=OuterRef('pk'),
+        video__curriculum_day__course_id=OuterRef('course_id'),
+    ).values('courseprogress_id').annotate(n=Count('id')).values('n')
+    total = Video.objects.filter(
+        curriculum_day__course_id=OuterRef('course_id'),
+    ).values('curriculum_day__course_id').annotate(n=Count('id')).values('n')
+
+    completed = Coalesce(Subquery(completed, output_field=IntegerField()), Value(0))
+    total = Coalesce(Subquery(total, output_field=IntegerField()), Value(0))
+    return progress.update(
+        completed_count=completed,
+        total_count=total,
+        progress_percentage=CourseProgress.percentage_expression(completed, total),
+    )
+
+
+def record_completed_videos(pairs):
+    """
+    CourseProgress.record_completed_video() for many (user_id, video_id)
+    pairs at once: link the videos in completed_videos (creating progress
+    rows as needed), recount the progress rows they touch and issue the
+    certificates of courses that are now complete. Safe to repeat.
+    """
+    if not pairs:
+        return
+
+    course_of = dict(
+        Video.objects.filter(id__in={video_id for _, video_id in pairs})
+        .values_list('id', 'curriculum_day__course_id')
+    )
+    pairs = {(user_id, video_id) for user_id, video_id in pairs if video_id in course_of}
+    if not pairs:
+        return
+    progress_keys = {(user_id, course_of[video_id]) for user_id, video_id in pairs}
+
+    CourseProgress.objects.bulk_create(
+        [CourseProgress(user_id=user_id, course_id=course_id) for user_id, course_id in progress_keys],
+        ignore_conflicts=True,
+    )
+    progress_ids = {
+        (user_id, course_id): progress_id
+        for progress_id, user_id, course_id in CourseProgress.objects.filter(
+            user_id__in={user_id for user_id, _ in progress_keys},
+            course_id__in={course_id for _, course_id in progress_keys},
+        ).values_list('id', 'user_id', 'course_id')
+        if (user_id, course_id) in progress_keys
+    }
+
+    through = CourseProgress.completed_videos.through
+    through.objects.bulk_create(
+        [
+            through(courseprogress_id=progress_ids[user_id, course_of[video_id]], video_id=video_id)
+            for user_id, video_id in pairs
+        ],
+        ignore_conflicts=True,
+    )
+    touched = CourseProgress.objects.filter(id__in=list(progress_ids.values()))
+    recount_course_progress(touched)
+
+    # Only rows that just ran out of videos with the quiz already passed
+    for progress in touched.filter(
+        quiz_passed=True, is_completed=False, total_count__gt=0, completed_count__gte=F('total_count'),
+    ):
+        progress.check_completion()
+
+
+# ============================
+# WRITE-BEHIND HEARTBEAT BUFFER
+# ============================
+Heartbeat = namedtuple('Heartbeat', ['watched_duration', 'watched_percentage', 'is_completed'])
+
+
+def _merge(old, new):
+    """Coalesce two heartbeats for the same (user, video), keeping the furthest point"""
+    if old is None:
+        return new
+    return Heartbeat(
+        watched_duration=max(old.watched_duration, new.watched_duration),
+        watched_percentage=max(old.watched_percentage, new.watched_percentage),
+        is_completed=old.is_completed or new.is_completed,
+    )
+
+
+def write_progress_batch(heartbeats):
+    """
+    Persist {(user_id, video_id): Heartbeat} in bulk.
+
+    Missing rows are inserted, then one UPDATE merges every heartbeat with
+    GREATEST() and never clears is_completed. The merge happens in the
+    database, so a late, smaller heartbeat (or a concurrent write) never
+    moves a row backwards. Videos completed by these heartbeats are passed
+    on to record_completed_videos().
+    """
+    if not heartbeats:
+        return 0
+
+    # Also drops heartbeats for videos that no longer exist
+    durations = dict(
+        Video.objects.filter(id__in={video_id for _, video_id in heartbeats})
+        .values_list('id', 'duration_seconds')
+    )
+
+    now = timezone.now()
+    rows = []
+    completed = []
+    for (user_id, video_id), beat in heartbeats.items():
+        if video_id not in durations:
+            continue
+
+        watched_percentage = beat.watched_percentage
+        video_seconds = durations[video_id]
+        if video_seconds:
+            watched_percentage = max(
+                watched_percentage,
+                min(int(beat.watched_duration * 100 / video_seconds), 100)
+            )
+        watched_percentage = min(watched_percentage, 100)
+
+        # Same rule as UserVideoProgress.save(): 95% watched counts as complete
+        is_completed = beat.is_completed or watched_percentage >= 95
+        if is_completed:
+            completed.append((user_id, video_id))
+        rows.append(UserVideoProgress(
+            user_id=user_id,
+            video_id=video_id,
+            watched_duration=beat.watched_duration,
+            watched_percentage=watched_percentage,
+            is_completed=is_completed,
+            last_watched=now,
+        ))
+
+    if not rows:
+        return 0
+
+    def merged(field, values):
+        whens = [When(user_id=row.user_id, video_id=row.video_id, then=Value(value)) for row, value in values]
+        return Case(*whens, default=F(field), output_field=UserVideoProgress._meta.get_field(field))
+
+    with transaction.atomic():
+        UserVideoProgress.objects.bulk_create(rows, ignore_conflicts=True)
+        UserVideoProgress.objects.filter(
+            reduce(or_, (Q(user_id=row.user_id, video_id=row.video_id) for row in rows))
+        ).update(
+            watched_duration=Greatest(
+                F('watched_duration'), merged('watched_duration', ((row, row.watched_duration) for row in rows))
+            ),
+            watched_percentage=Greatest(
+                F('watched_percentage'), merged('watched_percentage', ((row, row.watched_percentage) for row in rows))
+            ),
+            is_completed=merged('is_completed', ((row, True) for row in rows if row.is_completed)),
+            last_watched=now,
+        )
+        record_completed_videos(completed)
+    return len(rows)
+
+
+class ProgressBuffer:
+    """
+    In-process write-behind buffer for player heartbeats.
+
+    Heartbeats are coalesced per (user, video) and flushed in bulk (see
+    write_progress_batch) once PROGRESS_BUFFER_MAX_SIZE distinct pairs are pending, or
+    PROGRESS_BUFFER_FLUSH_SECONDS after the first pending heartbeat, and
+    again when the worker exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'PROGRESS_BUFFER_MAX_SIZE', 200)
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, 'PROGRESS_BUFFER_FLUSH_SECONDS', 5)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, user_id, video_id, watched_duration=0, watched_percentage=0, is_completed=False,
+            background=False):
+        """
+        Buffer one heartbeat. With background=True a size-triggered flush runs
+        on a worker thread, so callers on an event loop never block on it.
+        """
+        beat = Heartbeat(
+            max(int(watched_duration), 0),
+            min(max(int(watched_percentage), 0), 100),
+            bool(is_completed),
+        )
+        key = (user_id, video_id)
+
+        with self._lock:
+            self._pending[key] = _merge(self._pending.get(key), beat)
+            size = len(self._pending)
+            if size < self.max_size and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if size >= self.max_size:
+            if background:
+                threading.Thread(target=self._flush_in_thread, daemon=True).start()
+            else:
+                self.flush()
+
+    def pop(self, user_id, video_id):
+        """Take a pending heartbeat out of the buffer (e.g. to write it synchronously)"""
+        with self._lock:
+            return self._pending.pop((user_id, video_id), None)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return 0
+
+        try:
+            return write_progress_batch(pending)
+        except Exception:
+            logger.exception("Failed to flush %d video progress heartbeats", len(pending))
+            # Put them back so the next flush retries
+            with self._lock:
+                for key, beat in pending.items():
+                    self._pending[key] = _merge(self._pending.get(key), beat)
+            return 0
+
+    def _flush_in_thread(self):
+        # flush() cancels and clears the pending timer (if this isn't it)
+        close_old_connections()
+        try:
+            self.flush()
+        finally:
+            # The timer thread owns its own connection; don't leak it
+            connections.close_all()
+
+
+progress_buffer = ProgressBuffer()
+
+# Durable flush when the worker shuts down
+atexit.register(progress_buffer.flush)
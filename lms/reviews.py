@@ -0,0 +1,67 @@
+# lms/reviews.py
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .catalog import decode_cursor, encode_cursor
+from .models import CourseReview
+
+
+FIRST_PAGE_KEY = "course-reviews:{course_id}"
+
+# reviews is a list of plain dicts (see review_payload), newest first
+ReviewPage = namedtuple('ReviewPage', ['reviews', 'next_cursor'])
+
+
+def review_payload(review):
+    """JSON-ready review; computed once per review and cached with its page"""
+    return {
+        'id': review.pk,
+        'name': review.name,
+        'rating': review.rating,
+        'review': review.review,
+        'photo_url': review.get_photo_url,
+        'created_at': review.created_at.isoformat(),
+    }
+
+
+def fetch_review_page(course_id, cursor=None, page_size=None):
+    """
+    Return one page of a course's reviews, newest first, seeking past the
+    cursor on (created_at, id) like the catalog does.
+    """
+    if page_size is None:
+        page_size = getattr(settings, 'REVIEWS_PAGE_SIZE', 10)
+
+    # course_id too: the rating counters' post_init handler reads it
+    queryset = CourseReview.objects.filter(course_id=course_id).only(
+        'id', 'course_id', 'name', 'rating', 'review', 'photo', 'created_at'
+    ).order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    reviews = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(reviews) > page_size:
+        reviews = reviews[:page_size]
+        next_cursor = encode_cursor(reviews[-1])
+    return ReviewPage(reviews=[review_payload(review) for review in reviews], next_cursor=next_cursor)
+
+
+def get_first_review_page(course_id):
+    """Return the cached first page of reviews, building it on a miss"""
+    key = FIRST_PAGE_KEY.format(course_id=course_id)
+    page = cache.get(key)
+    if page is None:
+        page = fetch_review_page(course_id)
+        cache.set(key, page, getattr(settings, 'REVIEWS_CACHE_TIMEOUT', 60 * 60))
+    return page
+
+
+def forget_review_page(course_id):
+    cache.delete(FIRST_PAGE_KEY.format(course_id=course_id))
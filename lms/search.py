@@ -0,0 +1,229 @@
+# lms/search.py
+import re
+import threading
+import uuid
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import Course
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Postgres text search configuration; must match the one in migration 0042
+SEARCH_CONFIG = 'english'
+
+# Shared by every worker process; changes whenever a search document does
+INDEX_VERSION_KEY = "course-search-index:version"
+
+SearchPage = namedtuple('SearchPage', ['courses', 'total', 'page', 'has_next'])
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def build_search_document(course):
+    """
+    Flatten everything searchable about a course except its title (which is
+    indexed separately with a higher weight) into one text blob.
+    """
+    parts = [
+        course.short_description,
+        course.tagline,
+        (course.skills or '').replace(',', ' '),
+        (course.tools_learned or '').replace(',', ' '),
+    ]
+    if course.category_id:
+        parts.append(course.category.name)
+    parts.extend(instructor.name for instructor in course.instructors.all())
+    return ' '.join(part for part in parts if part)
+
+
+# ============================
+# IN-MEMORY INDEX (SQLite)
+# ============================
+def get_index_version():
+    """Current shared index version (created on first use or after eviction)"""
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(INDEX_VERSION_KEY, version, None):
+            version = cache.get(INDEX_VERSION_KEY, version)
+    return version
+
+
+def bump_index_version():
+    # A random token rather than a counter, so an evicted key can never
+    # come back with a value some worker already built its index from
+    version = uuid.uuid4().hex
+    cache.set(INDEX_VERSION_KEY, version, None)
+    return version
+
+
+class InMemorySearchIndex:
+    """
+    Inverted index token -> {course_id: weight} used when the database has
+    no full-text search.
+
+    Each worker process builds its own copy lazily from the stored
+    search documents. refresh_search_documents() moves the shared version
+    (INDEX_VERSION_KEY in the cache) and every worker, including the one
+    that made the change, rebuilds on its next search. Searches cost one
+    cache read on top of the index lookup.
+    """
+    TITLE_WEIGHT = 3.0
+    BODY_WEIGHT = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = None
+        self._version = None
+
+    def _ensure_built(self, version):
+        if self._postings is not None and self._version == version:
+            return
+        self._postings = {}
+        self._version = version
+        for course_id, title, document, is_active in Course.objects.values_list(
+            'id', 'title', 'search_document', 'is_active'
+        ):
+            self._add(course_id, title, document, is_active)
+
+    def _add(self, course_id, title, document, is_active):
+        weights = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0) + self.TITLE_WEIGHT
+        for token in tokenize(document):
+            weights[token] = weights.get(token, 0) + self.BODY_WEIGHT
+
+        for token, weight in weights.items():
+            self._postings.setdefault(token, {})[course_id] = (weight, is_active)
+
+    def search(self, query, active_only=True):
+        """
+        Return [(course_id, score)] best first. Every query term must match;
+        the last one also matches as a prefix (search-as-you-type).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        version = get_index_version()
+        with self._lock:
+            self._ensure_built(version)
+            scores = None
+            for index, term in enumerate(terms):
+                matches = {}
+                if index == len(terms) - 1:
+                    for token, postings in self._postings.items():
+                        if token.startswith(term):
+                            for course_id, (weight, is_active) in postings.items():
+                                if is_active or not active_only:
+                                    matches[course_id] = max(matches.get(course_id, 0), weight)
+                else:
+                    for course_id, (weight, is_active) in self._postings.get(term, {}).items():
+                        if is_active or not active_only:
+                            matches[course_id] = weight
+
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {
+                        course_id: score + matches[course_id]
+                        for course_id, score in scores.items()
+                        if course_id in matches
+                    }
+                if not scores:
+                    return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+memory_index = InMemorySearchIndex()
+
+
+# ============================
+# INDEX MAINTENANCE
+# ============================
+def refresh_search_documents(course_ids):
+    """Recompute search_document for some courses (used by signals)"""
+    course_ids = set(course_ids)
+    if not course_ids:
+        return
+
+    courses = list(
+        Course.objects.filter(id__in=course_ids)
+        .select_related('category')
+        .prefetch_related('instructors')
+    )
+    for course in courses:
+        course.search_document = build_search_document(course)
+    Course.objects.bulk_update(courses, ['search_document'])
+
+    # Postgres regenerates the stored tsvector column by itself. Elsewhere
+    # the shared index version moves once the new documents are committed,
+    # and every worker rebuilds its in-memory index on its next search.
+    if not uses_postgres_search():
+        transaction.on_commit(bump_index_version)
+
+
+# ============================
+# QUERIES
+# ============================
+def _postgres_matches(queryset, query):
+    tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    return queryset.filter(
+        RawSQL(f"lms_course.search_vector @@ {tsquery}", [query], output_field=BooleanField())
+    ).annotate(
+        rank=RawSQL(f"ts_rank(lms_course.search_vector, {tsquery})", [query], output_field=FloatField())
+    ).order_by('-rank', '-id')
+
+
+def search_course_ids(query, active_only=True):
+    """Ranked ids of matching courses, best first"""
+    if not tokenize(query):
+        return []
+
+    if uses_postgres_search():
+        queryset = Course.objects.all()
+        if active_only:
+            queryset = queryset.filter(is_active=True)
+        return list(_postgres_matches(queryset, query).values_list('id', flat=True))
+
+    return [course_id for course_id, _ in memory_index.search(query, active_only=active_only)]
+
+
+def search_courses(query, page=1, page_size=12):
+    """Return one ranked page of active courses matching ``query``"""
+    page = max(int(page), 1)
+    offset = (page - 1) * page_size
+
+    if not tokenize(query):
+        return SearchPage(courses=[], total=0, page=page, has_next=False)
+
+    if uses_postgres_search():
+        matches = _postgres_matches(Course.objects.filter(is_active=True), query)
+        total = matches.count()
+        courses = list(matches.select_related('category')[offset:offset + page_size])
+    else:
+        ranked = search_course_ids(query)
+        total = len(ranked)
+        page_ids = ranked[offset:offset + page_size]
+        by_id = Course.objects.select_related('category').in_bulk(page_ids)
+        courses = [by_id[course_id] for course_id in page_ids if course_id in by_id]
+
+    return SearchPage(
+        courses=courses,
+        total=total,
+        page=page,
+        has_next=offset + page_size < total,
+    )
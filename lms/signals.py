@@ -0,0 +1,363 @@
+# lms/signals.py
+from django.db.models.signals import post_init, pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import (
+    Course, CurriculumDay, Video, Question, Answer,
+    HeroSection, FeatureSection, FeatureItem, HomeAboutSection,
+    CourseCategory, HomeBanner, Instructor, Testimonial, FAQ,
+    Purchase, CourseEnrollment, CourseReview, CourseProgress,
+)
+from .curriculum import (
+    bump_curriculum_version,
+    drop_curriculum_tree,
+    forget_course_video_total,
+)
+from .grading import forget_answer_key
+from .home import mark_home_snapshot_stale
+from .catalog import forget_catalog_facets
+from .search import refresh_search_documents
+from .skills import sync_course_skills
+from .reviews import forget_review_page
+from .progress import recount_course_progress
+from . import stats
+
+
+# ============================
+# CURRICULUM TREE CACHE
+# ============================
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_curriculum_version(course_id=instance.pk)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    drop_curriculum_tree(instance)
+
+
+@receiver(post_save, sender=CurriculumDay)
+@receiver(post_delete, sender=CurriculumDay)
+def curriculum_day_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_curriculum_version(course_id=instance.course_id)
+    forget_course_video_total(instance.course_id)
+    if kwargs.get('signal') is post_delete:
+        recount_course_progress(CourseProgress.objects.filter(course_id=instance.course_id))
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def video_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = CurriculumDay.objects.filter(
+        pk=instance.curriculum_day_id
+    ).values_list('course_id', flat=True).first()
+    if course_id is None:
+        # The day is being deleted too; its own signal handles the course
+        return
+    bump_curriculum_version(course_id=course_id)
+    forget_course_video_total(course_id)
+    # Adding or removing a video changes every learner's total (and a
+    # deleted video's completed_videos rows are gone)
+    if kwargs.get('created', True):
+        recount_course_progress(CourseProgress.objects.filter(course_id=course_id))
+
+
+@receiver(m2m_changed, sender=CourseProgress.completed_videos.through)
+def completed_videos_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """completed_videos edited directly (record_completed_video keeps the counters itself)"""
+    if action == 'pre_clear' and reverse:
+        instance._progress_ids = list(instance.courseprogress_set.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        progress_ids = [instance.pk]
+    elif action == 'post_clear':
+        progress_ids = getattr(instance, '_progress_ids', ())
+    else:
+        progress_ids = pk_set or ()
+    recount_course_progress(CourseProgress.objects.filter(pk__in=progress_ids))
+
+
+# ============================
+# QUIZ ANSWER KEY CACHE
+# ============================
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    forget_answer_key(instance.quiz_id)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def answer_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    quiz_id = Question.objects.filter(
+        pk=instance.question_id
+    ).values_list('quiz_id', flat=True).first()
+    if quiz_id is None:
+        # The question is being deleted too; its own signal handles the quiz
+        return
+    forget_answer_key(quiz_id)
+
+
+# ============================
+# HOME PAGE SNAPSHOT
+# ============================
+HOME_PAGE_MODELS = (
+    HeroSection,
+    FeatureSection,
+    FeatureItem,
+    HomeAboutSection,
+    CourseCategory,
+    HomeBanner,
+    Instructor,
+    Testimonial,
+    FAQ,
+    Course,
+)
+
+
+def home_page_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_home_snapshot_stale()
+
+
+for model in HOME_PAGE_MODELS:
+    post_save.connect(home_page_changed, sender=model, dispatch_uid=f"home-page-save-{model.__name__}")
+    post_delete.connect(home_page_changed, sender=model, dispatch_uid=f"home-page-delete-{model.__name__}")
+
+
+# ============================
+# CATALOG FACET COUNTS
+# ============================
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=CourseCategory)
+@receiver(post_delete, sender=CourseCategory)
+def catalog_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    forget_catalog_facets()
+
+
+# ============================
+# COURSE SEARCH INDEX
+# ============================
+@receiver(post_save, sender=Course)
+def course_search_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_search_documents([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def course_search_deleted(sender, instance, **kwargs):
+    refresh_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=Instructor)
+def instructor_search_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_search_documents(instance.courses.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=CourseCategory)
+def category_search_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_search_documents(instance.courses.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Instructor)
+@receiver(pre_delete, sender=CourseCategory)
+def search_owner_deleting(sender, instance, **kwargs):
+    # Relations are gone by post_delete, so remember the affected courses now
+    instance._search_course_ids = list(instance.courses.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Instructor)
+@receiver(post_delete, sender=CourseCategory)
+def search_owner_deleted(sender, instance, **kwargs):
+    refresh_search_documents(getattr(instance, '_search_course_ids', ()))
+
+
+@receiver(m2m_changed, sender=Course.instructors.through)
+def course_instructors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._search_course_ids = list(instance.courses.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        refresh_search_documents([instance.pk])
+    elif action == 'post_clear':
+        refresh_search_documents(getattr(instance, '_search_course_ids', ()))
+    else:
+        refresh_search_documents(pk_set or ())
+
+
+# ============================
+# NORMALIZED SKILLS & TOOLS
+# ============================
+@receiver(post_save, sender=Course)
+def course_skills_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if sync_course_skills(instance):
+        forget_catalog_facets()
+
+
+# ============================
+# COURSE REVIEWS FIRST PAGE
+# ============================
+@receiver(post_save, sender=CourseReview)
+@receiver(post_delete, sender=CourseReview)
+def review_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # The course as loaded (resolved by the counters' pre_save/pre_delete)
+    # covers moved reviews and deleted ones whose course_id was deferred
+    course_ids = set()
+    original = getattr(instance, '_original_rating', None)
+    if isinstance(original, tuple):
+        course_ids.add(original[0])
+    if 'course_id' in instance.__dict__ or not course_ids:
+        course_ids.add(instance.course_id)
+    for course_id in course_ids:
+        forget_review_page(course_id)
+
+
+# ============================
+# COURSE LEARNER & RATING COUNTERS
+# ============================
+# Values as loaded are kept on the instance so saves and deletes can tell
+# what changed. They are read from __dict__: touching a deferred field in
+# post_init would refresh the instance, which runs post_init again.
+_DEFERRED = object()
+PURCHASE_TRACKED = ('payment_status',)
+REVIEW_TRACKED = ('course_id', 'rating')
+
+
+def _loaded_values(instance, fields):
+    """Tuple of the loaded values, None for a new instance, _DEFERRED if any wasn't loaded"""
+    if instance.pk is None:
+        return None
+    try:
+        return tuple(instance.__dict__[field] for field in fields)
+    except KeyError:
+        return _DEFERRED
+
+
+def _resolve_original(sender, instance, attr, fields):
+    """Fetch the stored values when they were deferred at load time"""
+    if getattr(instance, attr, None) is _DEFERRED:
+        setattr(instance, attr, sender._base_manager.filter(pk=instance.pk).values_list(*fields).first())
+
+
+def _saves_tracked_fields(instance, fields, update_fields):
+    """Whether this save can write any of the tracked fields"""
+    if update_fields is not None:
+        names = {*fields, *(field.removesuffix('_id') for field in fields)}
+        return bool(names & set(update_fields))
+    # Deferred fields that were never set aren't written
+    return any(field in instance.__dict__ for field in fields)
+
+
+@receiver(post_init, sender=Purchase)
+def purchase_loaded(sender, instance, **kwargs):
+    instance._original_purchase = _loaded_values(instance, PURCHASE_TRACKED)
+
+
+@receiver(pre_save, sender=Purchase)
+def purchase_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _saves_tracked_fields(instance, PURCHASE_TRACKED, update_fields):
+        _resolve_original(sender, instance, '_original_purchase', PURCHASE_TRACKED)
+
+
+@receiver(post_save, sender=Purchase)
+def purchase_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _saves_tracked_fields(instance, PURCHASE_TRACKED, update_fields):
+        return
+    original = instance._original_purchase
+    was_completed = original is not None and original[0] == 'completed'
+    is_completed = instance.payment_status == 'completed'
+    if is_completed and not was_completed:
+        stats.purchase_completed(instance)
+    elif was_completed and not is_completed:
+        stats.purchase_revoked(instance)
+    instance._original_purchase = (instance.payment_status,)
+
+
+@receiver(pre_delete, sender=Purchase)
+def purchase_deleting(sender, instance, **kwargs):
+    _resolve_original(sender, instance, '_original_purchase', PURCHASE_TRACKED)
+
+
+@receiver(post_delete, sender=Purchase)
+def purchase_deleted(sender, instance, **kwargs):
+    original = instance._original_purchase
+    if original is not None and original[0] == 'completed':
+        stats.purchase_revoked(instance)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def enrollment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    stats.enrollment_created(instance)
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    stats.enrollment_deleted(instance)
+
+
+@receiver(post_init, sender=CourseReview)
+def review_loaded(sender, instance, **kwargs):
+    instance._original_rating = _loaded_values(instance, REVIEW_TRACKED)
+
+
+@receiver(pre_save, sender=CourseReview)
+def review_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw and _saves_tracked_fields(instance, REVIEW_TRACKED, update_fields):
+        _resolve_original(sender, instance, '_original_rating', REVIEW_TRACKED)
+
+
+@receiver(post_save, sender=CourseReview)
+def review_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _saves_tracked_fields(instance, REVIEW_TRACKED, update_fields):
+        return
+    original = instance._original_rating
+    if original is None:
+        stats.add_rating(instance.course_id, instance.rating)
+    elif original[0] != instance.course_id:
+        stats.add_rating(original[0], original[1], sign=-1)
+        stats.add_rating(instance.course_id, instance.rating)
+    else:
+        stats.change_rating(instance.course_id, original[1], instance.rating)
+    instance._original_rating = (instance.course_id, instance.rating)
+
+
+@receiver(pre_delete, sender=CourseReview)
+def review_deleting(sender, instance, **kwargs):
+    _resolve_original(sender, instance, '_original_rating', REVIEW_TRACKED)
+
+
+@receiver(post_delete, sender=CourseReview)
+def review_deleted(sender, instance, **kwargs):
+    if instance._original_rating is not None:
+        stats.add_rating(*instance._original_rating, sign=-1)
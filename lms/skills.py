@@ -0,0 +1,69 @@
+# lms/skills.py
+from .models import Course, Skill, Tool, CourseSkillLink, CourseToolLink
+
+
+def split_names(text):
+    """Split comma-separated text into unique names, keeping the first spelling"""
+    names = []
+    seen = set()
+    for part in (text or '').split(','):
+        name = part.strip()
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def _get_or_create_all(model, names, icon_map, default_icon):
+    """Return {key: instance} for ``names``, creating missing rows with their icon resolved"""
+    keys = {name.lower(): name for name in names}
+    existing = {obj.key: obj for obj in model.objects.filter(key__in=keys)}
+
+    missing = [
+        model(key=key, name=name, icon=icon_map.get(key, default_icon))
+        for key, name in keys.items()
+        if key not in existing
+    ]
+    if missing:
+        # Another request may create the same key concurrently
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = {obj.key: obj for obj in model.objects.filter(key__in=keys)}
+    return existing
+
+
+def _sync_links(course, text, model, link_model, field, icon_map, default_icon):
+    names = split_names(text)
+    wanted = [name.lower() for name in names]
+
+    current = list(
+        link_model.objects.filter(course=course)
+        .order_by('position')
+        .values_list(f'{field}__key', flat=True)
+    )
+    if current == wanted:
+        return False
+
+    objects = _get_or_create_all(model, names, icon_map, default_icon)
+    link_model.objects.filter(course=course).delete()
+    link_model.objects.bulk_create([
+        link_model(course=course, position=position, **{field: objects[key]})
+        for position, key in enumerate(wanted)
+    ])
+    return True
+
+
+def sync_course_skills(course):
+    """
+    Mirror ``Course.skills`` / ``Course.tools_learned`` into the normalized
+    Skill / Tool links. Only writes when the parsed list actually changed.
+    """
+    skills_changed = _sync_links(
+        course, course.skills, Skill, CourseSkillLink, 'skill',
+        Course.SKILL_ICON_MAP, 'fas fa-code',
+    )
+    tools_changed = _sync_links(
+        course, course.tools_learned, Tool, CourseToolLink, 'tool',
+        Course.TOOL_ICON_MAP, 'fas fa-toolbox',
+    )
+    return skills_changed or tools_changed
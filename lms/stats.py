@@ -0,0 +1,117 @@
+# lms/stats.py
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Course, CourseEnrollment, CourseReview, Purchase
+
+
+RATING_FIELDS = {stars: f'rating_{stars}' for stars in range(1, 6)}
+COUNTER_FIELDS = ['learner_count', 'rating_count', 'rating_sum', *RATING_FIELDS.values()]
+
+
+def _bump(field, delta):
+    # Counters never go below zero, even if they had drifted
+    return Greatest(F(field) + delta, Value(0))
+
+
+# ============================
+# LEARNERS
+# ============================
+# A learner is a user with a CourseEnrollment or a completed Purchase for the
+# course. Paid checkouts create both, so each event only counts when the
+# other source doesn't already cover the user.
+def purchase_completed(purchase):
+    if not CourseEnrollment.objects.filter(user_id=purchase.user_id, course_id=purchase.course_id).exists():
+        Course.objects.filter(pk=purchase.course_id).update(learner_count=_bump('learner_count', 1))
+
+
+def purchase_revoked(purchase):
+    if not CourseEnrollment.objects.filter(user_id=purchase.user_id, course_id=purchase.course_id).exists():
+        Course.objects.filter(pk=purchase.course_id).update(learner_count=_bump('learner_count', -1))
+
+
+def _has_completed_purchase(user_id, course_id):
+    return Purchase.objects.filter(
+        user_id=user_id, course_id=course_id, payment_status='completed'
+    ).exists()
+
+
+def enrollment_created(enrollment):
+    if not _has_completed_purchase(enrollment.user_id, enrollment.course_id):
+        Course.objects.filter(pk=enrollment.course_id).update(learner_count=_bump('learner_count', 1))
+
+
+def enrollment_deleted(enrollment):
+    if not _has_completed_purchase(enrollment.user_id, enrollment.course_id):
+        Course.objects.filter(pk=enrollment.course_id).update(learner_count=_bump('learner_count', -1))
+
+
+# ============================
+# RATINGS
+# ============================
+def add_rating(course_id, rating, sign=1):
+    """Apply (sign=1) or remove (sign=-1) one review's rating"""
+    updates = {
+        'rating_count': _bump('rating_count', sign),
+        'rating_sum': _bump('rating_sum', sign * rating),
+    }
+    if rating in RATING_FIELDS:
+        field = RATING_FIELDS[rating]
+        updates[field] = _bump(field, sign)
+    Course.objects.filter(pk=course_id).update(**updates)
+
+
+def change_rating(course_id, old_rating, new_rating):
+    if old_rating == new_rating:
+        return
+    updates = {'rating_sum': _bump('rating_sum', new_rating - old_rating)}
+    if old_rating in RATING_FIELDS:
+        updates[RATING_FIELDS[old_rating]] = _bump(RATING_FIELDS[old_rating], -1)
+    if new_rating in RATING_FIELDS:
+        updates[RATING_FIELDS[new_rating]] = _bump(RATING_FIELDS[new_rating], 1)
+    Course.objects.filter(pk=course_id).update(**updates)
+
+
+# ============================
+# RECONCILIATION
+# ============================
+def compute_course_stats(courses):
+    """
+    Recount every counter from the source tables in one query and return
+    {course_id: {field: value}}.
+    """
+    enrolled = CourseEnrollment.objects.filter(
+        course_id=OuterRef('course_id'), user_id=OuterRef('user_id')
+    )
+    learners = Purchase.objects.filter(
+        course_id=OuterRef('pk'), payment_status='completed'
+    ).exclude(Exists(enrolled)).values('course_id').annotate(n=Count('id')).values('n')
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=OuterRef('pk')
+    ).values('course_id').annotate(n=Count('id')).values('n')
+    reviews = CourseReview.objects.filter(course_id=OuterRef('pk')).values('course_id')
+
+    def count_of(subquery):
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    def review_aggregate(aggregate):
+        return count_of(reviews.annotate(n=aggregate).values('n'))
+
+    annotations = {
+        'learner_total': count_of(learners) + count_of(enrollments),
+        'rating_count_total': review_aggregate(Count('id')),
+        'rating_sum_total': review_aggregate(Sum('rating')),
+    }
+    for stars, field in RATING_FIELDS.items():
+        annotations[f'{field}_total'] = review_aggregate(Count('id', filter=Q(rating=stars)))
+
+    stats = {}
+    for row in courses.annotate(**annotations).values('pk', *annotations):
+        stats[row['pk']] = {
+            'learner_count': row['learner_total'],
+            'rating_count': row['rating_count_total'],
+            'rating_sum': row['rating_sum_total'],
+            **{field: row[f'{field}_total'] for field in RATING_FIELDS.values()},
+        }
+    return stats
+
@@ -16,7 +16,9 @@ urlpatterns = [
     # Course pages
     path('courses/', views.all_courses, name='all_courses'),
     path('courses/category/<slug:category_slug>/', views.courses_by_category, name='courses_by_category'),
+    path('search/courses/', views.course_search, name='course_search'),
     path('courses/<slug:slug>/', views.course_detail, name='course_detail'),
+    path('courses/<slug:slug>/reviews/', views.course_reviews, name='course_reviews'),
     # lms/urls.py - add this
     path('courses/<slug:slug>/initiate-purchase/', views.initiate_purchase, name='initiate_purchase'),
     path('my-courses/', views.my_courses, name='my_courses'),
@@ -1,7 +1,11 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import logging
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth import login, authenticate, logout, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.db.models import Q, Prefetch
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -9,15 +13,9 @@ from django.views.decorators.http import require_POST
 from django.conf import settings
 from django.utils import timezone
 from urllib3 import request
-from .models import Instructor
-from .models import HomeBanner
-from .models import Testimonial, FAQ
 from .models import (
-    HeroSection,  
     Course, 
     CourseEnrollment,
-    FeatureSection, 
-    HomeAboutSection, 
     CourseCategory,  
     Payment,
     CurriculumDay,
@@ -29,62 +27,18 @@ import razorpay
 import json
 import uuid
 
+logger = logging.getLogger(__name__)
+
 # Get User model
 User = get_user_model()
 
-# Initialize Razorpay client
-razorpay_client = razorpay.Client(
-    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-)
-
 
 # ===== AUTHENTICATION VIEWS =====
 def home(request):
     """Home page view with hero section, categories, and featured courses"""
-    hero = HeroSection.objects.filter(is_active=True).first()
-    feature_section = FeatureSection.objects.filter(is_active=True).first()
-    about_section = HomeAboutSection.objects.filter(is_active=True).first()
-    
-    categories = CourseCategory.objects.filter(is_active=True).order_by('order')
-    banner = HomeBanner.objects.filter(is_active=True).first() 
-    instructors = Instructor.objects.all()
-    testimonials = Testimonial.objects.filter(is_active=True)
-    faqs = FAQ.objects.filter(is_active=True)
-    
-    # Try to get featured courses, fall back to regular courses
-    featured_courses = Course.objects.filter(is_active=True)
-    
-    # Check if Course model has is_featured field
-    if hasattr(Course, 'is_featured'):
-        featured_courses = featured_courses.filter(is_featured=True)
-    
-    featured_courses = featured_courses.order_by('-created_at')[:8]
-    
-    if featured_courses.count() < 8:
-        additional_courses = Course.objects.filter(
-            is_active=True
-        ).exclude(
-            id__in=[c.id for c in featured_courses]
-        ).order_by('-created_at')[:8 - featured_courses.count()]
-        courses = list(featured_courses) + list(additional_courses)
-    else:
-        courses = featured_courses
-    
-    all_courses_count = Course.objects.filter(is_active=True).count()
-    
-    context = {
-        'hero': hero,
-        'feature_section': feature_section,
-        'about_section': about_section,
-        'categories': categories,
-        'courses': courses,
-        'all_courses_count': all_courses_count,
-        'banner': banner,
-        'instructors': instructors,
-        'testimonials': testimonials,
-        'faqs': faqs,
-    }
-    return render(request, 'lms/home.html', context)
+    # Served from a cached snapshot; see lms/home.py
+    snapshot = get_home_snapshot()
+    return render(request, 'lms/home.html', snapshot.as_context())
 
 
 def login_view(request):
@@ -176,47 +130,107 @@ def logout_view(request):
 
 
 # ===== COURSE VIEWS =====
+def _catalog_page(request, courses):
+    """
+    Keyset-paginate a catalog queryset from ?cursor=.
+    Returns (page, error_response); ?format=json gets a 400 for a bad cursor.
+    """
+    courses = courses.select_related('category')
+    try:
+        return paginate_courses(courses, request.GET.get('cursor')), None
+    except ValueError:
+        if request.GET.get('format') == 'json':
+            return None, JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+        return paginate_courses(courses), None
+
+
+def _catalog_json(page):
+    return JsonResponse({
+        'courses': [course_card(course) for course in page.courses],
+        'next_cursor': page.next_cursor,
+    })
+
+
 def all_courses(request):
     """View for all courses page with filtering"""
-    courses = Course.objects.filter(is_active=True).order_by('-created_at')
-    categories = CourseCategory.objects.filter(is_active=True).order_by('order')
-    
-    category_counts = {}
-    for category in categories:
-        category_counts[category.slug] = Course.objects.filter(
-            category=category, 
-            is_active=True
-        ).count()
-    
-    all_courses_count = courses.count()
+    courses = Course.objects.filter(is_active=True)
     
     category_slug = request.GET.get('category')
     if category_slug:
         courses = courses.filter(category__slug=category_slug)
     
+    skill_key = request.GET.get('skill', '').strip().lower()
+    if skill_key:
+        courses = courses.filter(skill_tags__key=skill_key)
+    
+    page, error = _catalog_page(request, courses)
+    if error:
+        return error
+    if request.GET.get('format') == 'json':
+        return _catalog_json(page)
+    
+    categories = CourseCategory.objects.filter(is_active=True).order_by('order')
+    
+    # All counts come from one cached aggregate
+    facets = get_catalog_facets()
+    
     context = {
-        'courses': courses,
+        'courses': page.courses,
+        'next_cursor': page.next_cursor,
         'categories': categories,
-        'category_counts': category_counts,
-        'all_courses_count': all_courses_count,
+        'category_counts': facets.by_category,
+        'skill_facets': facets.by_skill,
+        'all_courses_count': facets.total,
         'selected_category': category_slug,
+        'selected_skill': skill_key,
     }
     return render(request, 'courses/all.html', context)
 
 
+def course_search(request):
+    """Ranked course search (JSON), see lms/search.py"""
+    query = request.GET.get('q', '').strip()
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        page = 1
+    
+    results = search_courses(query, page=page, page_size=getattr(settings, 'CATALOG_PAGE_SIZE', 12))
+    
+    return JsonResponse({
+        'query': query,
+        'total': results.total,
+        'page': results.page,
+        'has_next': results.has_next,
+        'courses': [course_card(course) for course in results.courses],
+    })
+
+
 def courses_by_category(request, category_slug):
     """View for courses filtered by category"""
     category = get_object_or_404(CourseCategory, slug=category_slug, is_active=True)
-    courses = Course.objects.filter(category=category, is_active=True).order_by('-created_at')
+    
+    page, error = _catalog_page(request, Course.objects.filter(category=category, is_active=True))
+    if error:
+        return error
+    if request.GET.get('format') == 'json':
+        return _catalog_json(page)
+    
     all_categories = CourseCategory.objects.filter(is_active=True).order_by('order')
+    facets = get_catalog_facets()
     
     context = {
         'category': category,
-        'courses': courses,
+        'courses': page.courses,
+        'next_cursor': page.next_cursor,
         'categories': all_categories,
+        'category_counts': facets.by_category,
+        'skill_facets': facets.by_skill,
+        'all_courses_count': facets.total,
         'selected_category': category_slug,
     }
-    return render(request, 'courses/category.html', context)
+    # Same page as the full catalog, with this category selected
+    return render(request, 'courses/all.html', context)
 
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
@@ -227,143 +241,62 @@ from .models import (
     Course, CurriculumDay, Purchase, UserVideoProgress, 
     CourseReview  # Use your existing CourseReview model
 )
-
-@require_http_methods(["GET", "POST"])
+from .access import CourseAccess
+from .progress import get_progress_map, progress_buffer
+from .curriculum import get_curriculum_tree, get_curriculum_trees
+from .grading import get_answer_key, save_responses
+from .home import get_home_snapshot
+from .catalog import get_catalog_facets, paginate_courses, course_card
+from .search import search_courses
+from .reviews import fetch_review_page, get_first_review_page
+from .payments import PaymentGatewayError, razorpay_gateway
+
+@require_http_methods(["GET"])
 def course_detail(request, slug):
-    """Display course detail page with curriculum and handle review submissions"""
+    """Display course detail page with curriculum"""
     
     course = get_object_or_404(
         Course.objects.prefetch_related(
-            'instructors',
-            Prefetch(
-                'curriculum_days',
-                queryset=CurriculumDay.objects.prefetch_related('videos').order_by('order', 'day_number')
-            )
+            'instructors', 'skill_links__skill', 'tool_links__tool'
         ),
         slug=slug,
         is_active=True
     )
 
-    # Handle AJAX POST requests (Review Submission)
-    if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        action = request.POST.get('action')
-        
-        if action == 'submit_review':
-            try:
-                # Validate required fields
-                name = request.POST.get('name', '').strip()
-                rating = request.POST.get('rating')
-                review_text = request.POST.get('review', '').strip()
-                
-                if not name:
-                    return JsonResponse({
-                        'success': False, 
-                        'error': 'Name is required'
-                    })
-                
-                if not rating:
-                    return JsonResponse({
-                        'success': False, 
-                        'error': 'Please select a rating'
-                    })
-                
-                if not review_text:
-                    return JsonResponse({
-                        'success': False, 
-                        'error': 'Review text is required'
-                    })
-                
-                # Validate rating value
-                try:
-                    rating_value = int(rating)
-                    if rating_value < 1 or rating_value > 5:
-                        return JsonResponse({
-                            'success': False, 
-                            'error': 'Rating must be between 1 and 5'
-                        })
-                except ValueError:
-                    return JsonResponse({
-                        'success': False, 
-                        'error': 'Invalid rating value'
-                    })
-                
-                # Check if user already reviewed this course (optional)
-                if request.user.is_authenticated:
-                    existing_review = CourseReview.objects.filter(
-                        user=request.user,
-                        course=course
-                    ).first()
-                    
-                    if existing_review:
-                        return JsonResponse({
-                            'success': False, 
-                            'error': 'You have already reviewed this course'
-                        })
-                
-                # Create review
-                review = CourseReview.objects.create(
-                    course=course,
-                    name=name,
-                    rating=rating_value,
-                    review=review_text,
-                    user=request.user if request.user.is_authenticated else None,
-                    # Set to True if you don't need moderation, False if you do
-                )
-                
-                return JsonResponse({
-                    'success': True, 
-                    'message': 'Thank you! Your review has been submitted successfully.'
-                })
-                
-            except Exception as e:
-                return JsonResponse({
-                    'success': False, 
-                    'error': f'An error occurred: {str(e)}'
-                })
-
-    # Check if user has purchased the course
-    user_has_paid = False
-    if request.user.is_authenticated:
-        user_has_paid = Purchase.objects.filter(
-            user=request.user,
-            course=course,
-            payment_status='completed'
-        ).exists()
+    # Purchase / enrollment state for the whole course (one query)
+    access = CourseAccess(request.user, course)
+    user_has_paid = access.has_paid
 
-    # Find first accessible video for "Start Learning" button
-    first_video = None
-    for day in course.curriculum_days.all():
-        for video in day.videos.all().order_by('order', 'id'):
-            if video.is_accessible_by(request.user):
-                first_video = video
-                break
-        if first_video:
-            break
+    # Cached Course -> Day -> Video tree
+    tree = get_curriculum_tree(course)
+
+    # All of the user's progress rows for this course (one query)
+    progress_map = get_progress_map(request.user, course)
 
     # Prepare curriculum with video access info
+    first_video = None
     curriculum_days = []
-    for day in course.curriculum_days.all():
+    for day in tree.days:
         day_data = {
             'day_number': day.day_number,
             'title': day.title,
             'description': day.description,
-            'is_free': day.is_free if hasattr(day, 'is_free') else False,
+            'is_free': day.is_free,
+            'duration': day.duration_display,
             'videos': []
         }
 
-        for video in day.videos.all().order_by('order', 'id'):
+        for video in day.videos:
             # Centralized access check
-            is_accessible = video.is_accessible_by(request.user)
+            is_accessible = access.can_access_video(video, day)
+
+            # First accessible video for "Start Learning" button
+            if is_accessible and first_video is None:
+                first_video = video
 
             # Check completion status
-            is_completed = False
-            if request.user.is_authenticated:
-                progress = UserVideoProgress.objects.filter(
-                    user=request.user,
-                    video=video
-                ).first()
-                if progress:
-                    is_completed = progress.is_completed
+            progress = progress_map.get(video.id)
+            is_completed = progress.is_completed if progress else False
 
             day_data['videos'].append({
                 'id': video.id,
@@ -372,15 +305,12 @@ def course_detail(request, slug):
                 'duration': video.duration,
                 'is_accessible': is_accessible,
                 'is_completed': is_completed,
-                'video_url': video.video_file.url if hasattr(video, 'video_file') and video.video_file else ''
             })
 
         curriculum_days.append(day_data)
 
-    # Get reviews - adjust based on your CourseReview model fields
-    reviews = CourseReview.objects.filter(
-        course=course
-    ).select_related('user').order_by('-created_at')[:10]
+    # Cached first page of reviews; later pages come from course_reviews
+    reviews = get_first_review_page(course.id)
 
     context = {
         'course': course,
@@ -390,12 +320,80 @@ def course_detail(request, slug):
         'discount_percentage': course.get_discount_percentage(),
         'skills_list': course.get_skills_list(),
         'tools_list': course.get_tools_list(),
-        'reviews': reviews,
+        'reviews': reviews.reviews,
+        'reviews_next_cursor': reviews.next_cursor,
     }
 
     return render(request, 'courses/detail.html', context)
 
 
+@require_http_methods(["GET", "POST"])
+def course_reviews(request, slug):
+    """
+    GET: one page of reviews as JSON (``?cursor=`` for the next page).
+    POST: submit a review. Neither touches the curriculum.
+    """
+    course = get_object_or_404(Course.objects.only('id'), slug=slug, is_active=True)
+
+    if request.method == 'POST':
+        return _submit_review(request, course)
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            page = fetch_review_page(course.id, cursor=cursor)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    else:
+        page = get_first_review_page(course.id)
+
+    return JsonResponse({
+        'reviews': page.reviews,
+        'next_cursor': page.next_cursor,
+    })
+
+
+def _submit_review(request, course):
+    name = request.POST.get('name', '').strip()
+    rating = request.POST.get('rating')
+    review_text = request.POST.get('review', '').strip()
+
+    if not name:
+        return JsonResponse({'success': False, 'error': 'Name is required'}, status=400)
+    if not rating:
+        return JsonResponse({'success': False, 'error': 'Please select a rating'}, status=400)
+    if not review_text:
+        return JsonResponse({'success': False, 'error': 'Review text is required'}, status=400)
+
+    try:
+        rating_value = int(rating)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid rating value'}, status=400)
+    if rating_value < 1 or rating_value > 5:
+        return JsonResponse({'success': False, 'error': 'Rating must be between 1 and 5'}, status=400)
+
+    if request.user.is_authenticated and CourseReview.objects.filter(
+        user=request.user, course=course
+    ).exists():
+        return JsonResponse({
+            'success': False,
+            'error': 'You have already reviewed this course'
+        }, status=400)
+
+    CourseReview.objects.create(
+        course=course,
+        name=name,
+        rating=rating_value,
+        review=review_text,
+        user=request.user if request.user.is_authenticated else None,
+    )
+
+    return JsonResponse({
+        'success': True,
+        'message': 'Thank you! Your review has been submitted successfully.'
+    })
+
+
 
 
 
@@ -572,16 +570,14 @@ def my_courses(request):
         user=request.user,
         payment_status='completed'
     ).select_related('course__category').prefetch_related(
-        'course__instructors',
-        'course__curriculum_days__videos'
+        'course__instructors'
     ).order_by('-purchased_at')
 
     # Legacy enrollments
     enrollments = CourseEnrollment.objects.filter(
         user=request.user
     ).select_related('course__category').prefetch_related(
-        'course__instructors',
-        'course__curriculum_days__videos'
+        'course__instructors'
     ).order_by('-enrolled_at')
 
     # Filter out enrollments that are already purchased
@@ -595,16 +591,11 @@ def my_courses(request):
     # Bulk fetch progress and certificates
     progress_map = {cp.course_id: cp for cp in CourseProgress.objects.filter(user=request.user, course_id__in=course_ids)}
     certificate_map = {cert.course_id: cert for cert in Certificate.objects.filter(user=request.user, course_id__in=course_ids)}
+    tree_map = get_curriculum_trees(all_courses)
 
     # Assign first video, progress, certificate
     def enhance_course(obj):
-        first_video = None
-        for day in obj.course.curriculum_days.all().order_by('order', 'day_number'):
-            videos = day.videos.all().order_by('order', 'id')
-            if videos.exists():
-                first_video = videos.first()
-                break
-        obj.first_video = first_video
+        obj.first_video = tree_map[obj.course.id].first_video
         obj.progress = progress_map.get(obj.course.id)
         obj.certificate = certificate_map.get(obj.course.id)
 
@@ -860,7 +851,9 @@ def video_player(request, video_id):
     # -------------------------------------------------
     # Access control
     # -------------------------------------------------
-    if not video.is_accessible_by(request.user):
+    access = CourseAccess(request.user, course)
+
+    if not access.can_access_video(video):
         if not request.user.is_authenticated:
             messages.error(request, "Please login to access this video.")
             return HttpResponseRedirect(
@@ -882,16 +875,23 @@ def video_player(request, video_id):
     watched_percentage = 0
     watched_duration = 0
 
+    # All of the user's progress rows for this course (one query)
+    progress_map = get_progress_map(request.user, course)
+
     if request.user.is_authenticated:
-        progress, _ = UserVideoProgress.objects.get_or_create(
-            user=request.user,
-            video=video,
-            defaults={
-                "is_completed": False,
-                "watched_percentage": 0,
-                "watched_duration": 0,
-            },
-        )
+        progress = progress_map.get(video.id)
+
+        if progress is None:
+            progress, _ = UserVideoProgress.objects.get_or_create(
+                user=request.user,
+                video=video,
+                defaults={
+                    "is_completed": False,
+                    "watched_percentage": 0,
+                    "watched_duration": 0,
+                },
+            )
+            progress_map[video.id] = progress
 
         is_completed = progress.is_completed
         progress_percentage = progress.progress_percentage
@@ -899,30 +899,20 @@ def video_player(request, video_id):
         watched_duration = progress.watched_duration
 
     # -------------------------------------------------
-    # Curriculum + video listing
+    # Curriculum + video listing (cached tree)
     # -------------------------------------------------
+    tree = get_curriculum_tree(course)
+
     curriculum_days = []
-    all_videos_list = []
     completed_days = 0
+    completed_videos = 0
 
-    curriculum_days_qs = (
-        CurriculumDay.objects.filter(course=course)
-        .prefetch_related("videos")
-        .order_by("order", "day_number")
-    )
-
-    for day in curriculum_days_qs:
+    for day in tree.days:
         day_videos = []
         completed_count = 0
 
-        for vid in day.videos.all().order_by("order", "id"):
-            vid_progress = None
-
-            if request.user.is_authenticated:
-                vid_progress = UserVideoProgress.objects.filter(
-                    user=request.user,
-                    video=vid,
-                ).first()
+        for vid in day.videos:
+            vid_progress = progress_map.get(vid.id)
 
             vid_completed = vid_progress.is_completed if vid_progress else False
             vid_percentage = (
@@ -939,8 +929,8 @@ def video_player(request, video_id):
                 {
                     "id": vid.id,
                     "title": vid.title,
-                    "duration": vid.duration or 0,
-                    "is_accessible": vid.is_accessible_by(request.user),
+                    "duration": vid.duration_display,
+                    "is_accessible": access.can_access_video(vid, day),
                     "is_completed": vid_completed,
                     "progress_percentage": vid_percentage,
                     "watched_percentage": vid_percentage,
@@ -949,8 +939,6 @@ def video_player(request, video_id):
                 }
             )
 
-            all_videos_list.append(vid)
-
         total_videos_in_day = len(day_videos)
         day_progress_percentage = (
             int((completed_count / total_videos_in_day) * 100)
@@ -960,11 +948,13 @@ def video_player(request, video_id):
 
         if day_progress_percentage == 100:
             completed_days += 1
+        completed_videos += completed_count
 
         curriculum_days.append(
             {
                 "id": day.id,
                 "title": day.title,
+                "duration": day.duration_display,
                 "videos": day_videos,
                 "completed_videos": completed_count,
                 "total_videos": total_videos_in_day,
@@ -973,41 +963,26 @@ def video_player(request, video_id):
         )
 
     # -------------------------------------------------
-    # Previous / Next video
+    # Previous / Next video (O(1) lookup in the tree)
     # -------------------------------------------------
     previous_video = None
     next_video = None
 
-    try:
-        idx = all_videos_list.index(video)
+    prev, nxt = tree.neighbours(video.id)
 
-        if idx > 0:
-            prev = all_videos_list[idx - 1]
-            if prev.is_accessible_by(request.user):
-                previous_video = prev
+    if prev and access.can_access_video(prev, tree.day_of(prev)):
+        previous_video = prev
 
-        if idx < len(all_videos_list) - 1:
-            nxt = all_videos_list[idx + 1]
-            if nxt.is_accessible_by(request.user):
-                next_video = nxt
-
-    except ValueError:
-        pass
+    if nxt and access.can_access_video(nxt, tree.day_of(nxt)):
+        next_video = nxt
 
     # -------------------------------------------------
     # Course progress (READ ONLY)
     # -------------------------------------------------
-    total_videos = len(all_videos_list)
-    completed_videos = 0
+    total_videos = tree.total_videos
     course_progress = 0
 
     if request.user.is_authenticated:
-        completed_videos = UserVideoProgress.objects.filter(
-            user=request.user,
-            video__in=all_videos_list,
-            is_completed=True,
-        ).count()
-
         course_progress = (
             int((completed_videos / total_videos) * 100)
             if total_videos
@@ -1051,6 +1026,7 @@ def video_player(request, video_id):
         "next_video": next_video,
         "course_progress": course_progress,
         "total_videos": total_videos,
+        "course_duration": tree.duration_display,
         "completed_videos": completed_videos,
         "completed_days": completed_days,
         "is_completed": is_completed,
@@ -1068,21 +1044,29 @@ def video_player(request, video_id):
 
 
 @login_required
-def update_video_progress(request, video_id):
-    video = get_object_or_404(Video, id=video_id)
+@require_POST
+async def update_video_progress(request, video_id):
+    """
+    Player heartbeat. Progress is coalesced in the write-behind buffer and
+    flushed to the database in bulk (see lms/progress.py), so the request
+    itself never waits on the database.
+    """
+    try:
+        progress_percentage = int(float(request.POST.get('progress', 0)))
+        watched_seconds = int(float(request.POST.get('watched_seconds', 0)))
+    except (TypeError, ValueError):
+        return JsonResponse({'success': False, 'error': 'Invalid progress values'}, status=400)
 
-    progress_percentage = int(request.POST.get('progress', 0))
     is_completed = request.POST.get('completed') == 'true'
-    watched_seconds = int(request.POST.get('watched_seconds', 0))
-
-    UserVideoProgress.objects.update_or_create(
-        user=request.user,
-        video=video,
-        defaults={
-            'progress_percentage': progress_percentage,
-            'is_completed': is_completed,
-            'watched_duration': watched_seconds
-        }
+    user = await request.auser()
+
+    progress_buffer.add(
+        user.id,
+        video_id,
+        watched_duration=watched_seconds,
+        watched_percentage=progress_percentage,
+        is_completed=is_completed,
+        background=True,
     )
 
     return JsonResponse({'success': True})
@@ -1118,16 +1102,22 @@ def enroll_course(request, slug):
 
 # ===== RAZORPAY PAYMENT VIEWS =====
 @login_required
-def checkout(request, slug):
-    """Checkout page for course purchase using Razorpay"""
-    course = get_object_or_404(Course, slug=slug, is_active=True)
+async def checkout(request, slug):
+    """
+    Checkout page for course purchase using Razorpay.
+
+    Async: the Razorpay order round-trip runs off the event loop, so one
+    ASGI worker keeps serving other requests while it waits.
+    """
+    course = await aget_object_or_404(Course, slug=slug, is_active=True)
+    user = await request.auser()
 
     # Check if already purchased or enrolled
-    if Purchase.objects.filter(user=request.user, course=course, payment_status='completed').exists():
+    if await Purchase.objects.filter(user=user, course=course, payment_status='completed').aexists():
         messages.info(request, f'You have already purchased "{course.title}"')
         return redirect('course_detail', slug=slug)
 
-    if CourseEnrollment.objects.filter(user=request.user, course=course).exists():
+    if await CourseEnrollment.objects.filter(user=user, course=course).aexists():
         messages.info(request, f'You are already enrolled in "{course.title}"')
         return redirect('course_detail', slug=slug)
 
@@ -1139,51 +1129,26 @@ def checkout(request, slug):
     total_amount = round(base_price + tax_amount, 2)
     amount_paise = int(total_amount * 100)
 
-    # DEBUG PRINTS - Check terminal for these
-    print("="*50)
-    print(f"CHECKOUT DEBUG:")
-    print(f"Course: {course.title}")
-    print(f"Base Price: ₹{base_price}")
-    print(f"Tax Amount: ₹{tax_amount}")
-    print(f"Total Amount: ₹{total_amount}")
-    print(f"Amount in Paise: {amount_paise}")
-    print(f"Razorpay Key ID: {settings.RAZORPAY_KEY_ID[:10]}...")  # Only show first 10 chars
-    print("="*50)
-
     # Create Razorpay order WITH ERROR HANDLING
     try:
-        order = razorpay_client.order.create({
-            'amount': amount_paise,
-            'currency': 'INR',
-            'payment_capture': '1',
-        })
-        
-        print(f"✓ Razorpay Order Created Successfully!")
-        print(f"Order ID: {order['id']}")
-        print("="*50)
-        
-    except Exception as e:
-        print("="*50)
-        print(f"✗ RAZORPAY ERROR:")
-        print(f"Error Type: {type(e).__name__}")
-        print(f"Error Message: {str(e)}")
-        print("="*50)
+        order = await sync_to_async(razorpay_gateway.create_order, thread_sensitive=False)(amount_paise)
+    except PaymentGatewayError:
+        logger.exception("Razorpay order creation failed for course %s", course.slug)
         messages.error(request, f'Unable to create payment order. Please try again later.')
         return redirect('course_detail', slug=slug)
 
     # Create Payment record
     try:
-        Payment.objects.create(
-            user=request.user,
+        await Payment.objects.acreate(
+            user=user,
             course=course,
             razorpay_order_id=order['id'],
             amount=total_amount,
             currency='INR',
             status='pending'
         )
-        print(f"✓ Payment record created in database")
-    except Exception as e:
-        print(f"✗ Database Error: {str(e)}")
+    except Exception:
+        logger.exception("Could not store payment for Razorpay order %s", order['id'])
 
     context = {
         'course': course,
@@ -1195,7 +1160,8 @@ def checkout(request, slug):
         'razorpay_key_id': settings.RAZORPAY_KEY_ID,
     }
 
-    return render(request, 'courses/checkout.html', context)
+    # Templates and context processors may still touch the ORM lazily
+    return await sync_to_async(render)(request, 'courses/checkout.html', context)
 
 
 from django.shortcuts import get_object_or_404, redirect
@@ -1207,11 +1173,12 @@ import razorpay
 
 
 @csrf_protect
-def verify_payment(request):
+async def verify_payment(request):
     """Verify Razorpay payment from browser checkout"""
     if request.method != 'POST':
         return HttpResponse("Invalid request method", status=405)
     
+    user = await request.auser()
     try:
         # Razorpay fields
         razorpay_order_id = request.POST.get('razorpay_order_id')
@@ -1219,21 +1186,21 @@ def verify_payment(request):
         razorpay_signature = request.POST.get('razorpay_signature')
         course_slug = request.POST.get('course_slug')
         
-        course = get_object_or_404(Course, slug=course_slug, is_active=True)
+        course = await aget_object_or_404(Course, slug=course_slug, is_active=True)
         
         # Get Payment record linked to user & order
-        payment = Payment.objects.get(
+        payment = await Payment.objects.aget(
             razorpay_order_id=razorpay_order_id,
-            user=request.user
+            user=user
         )
         
-        # Verify signature
+        # Verify signature (local HMAC, no network)
         params_dict = {
             'razorpay_order_id': razorpay_order_id,
             'razorpay_payment_id': razorpay_payment_id,
             'razorpay_signature': razorpay_signature
         }
-        razorpay_client.utility.verify_payment_signature(params_dict)
+        razorpay_gateway.verify_payment_signature(params_dict)
         
         # Update Payment object
         payment.razorpay_payment_id = razorpay_payment_id
@@ -1252,24 +1219,24 @@ def verify_payment(request):
         payment.billing_zip_code = request.POST.get('zip_code', '')
         payment.billing_country = request.POST.get('country', 'IN')
         payment.payment_method = request.POST.get('payment_method', 'card')
-        payment.save()
+        await payment.asave()
         
         # Create Purchase record
-        Purchase.objects.get_or_create(
-            user=request.user,
+        await Purchase.objects.aget_or_create(
+            user=user,
             course=course,
             defaults={
                 'amount_paid': payment.amount,
                 'payment_status': 'completed',
                 'transaction_id': razorpay_payment_id,
                 'full_name': f"{payment.billing_first_name} {payment.billing_last_name}",
-                'email': payment.billing_email or request.user.email
+                'email': payment.billing_email or user.email
             }
         )
         
         # Create CourseEnrollment
-        CourseEnrollment.objects.get_or_create(
-            user=request.user,
+        await CourseEnrollment.objects.aget_or_create(
+            user=user,
             course=course,
             defaults={
                 'enrollment_type': 'paid',
@@ -1438,7 +1405,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 
 @csrf_exempt
-def razorpay_callback(request):
+async def razorpay_callback(request):
     """
     Razorpay webhook endpoint for payment confirmation.
     Razorpay sends POST requests here after payment.
@@ -1447,18 +1414,17 @@ def razorpay_callback(request):
         return JsonResponse({"status": "invalid method"}, status=405)
 
     try:
-        # Optional: log incoming data for debugging
-        print("Razorpay callback received:", request.POST)
+        logger.info("Razorpay callback received: %s", request.POST)
 
         # You can optionally call your existing verify_payment logic here
         # For example, you could call:
-        # return verify_payment(request)
+        # return await verify_payment(request)
 
         # Or just respond OK for testing:
         return JsonResponse({"status": "success"})
 
     except Exception as e:
-        print("Razorpay callback error:", str(e))
+        logger.exception("Razorpay callback error")
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
 
@@ -1654,7 +1620,7 @@ from django.http import JsonResponse
 from django.utils import timezone
 from django.contrib import messages
 from .models import (
-    Quiz, QuizAttempt, QuizResponse, Question, Answer,
+    Quiz, QuizAttempt, Question,
     CourseProgress, Certificate, Course
 )
 
@@ -1749,8 +1715,13 @@ from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.contrib import messages
 
+@login_required
 def quiz_submit(request, attempt_id):
-    attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    attempt = get_object_or_404(
+        QuizAttempt.objects.select_related('quiz'),
+        id=attempt_id,
+        user=request.user
+    )
 
     if request.method != "POST":
         return redirect("quiz_take", attempt.quiz.id)
@@ -1760,32 +1731,16 @@ def quiz_submit(request, attempt_id):
         messages.error(request, "This quiz attempt is already submitted.")
         return redirect("quiz_result", attempt.id)
 
-    for question in attempt.quiz.questions.all():
-        key = f"question_{question.id}"
-        selected_ids = request.POST.getlist(key)
-
-        if not selected_ids:
-            continue  # unanswered question
-
-        # Validate answers belong to this question
-        answers = Answer.objects.filter(
-            id__in=selected_ids,
-            question=question
-        )
-
-        if not answers.exists():
-            continue
+    # Validate every answer against the cached key, in memory
+    answer_key = get_answer_key(attempt.quiz_id)
+    selections = answer_key.parse_submission(request.POST)
 
-        response = QuizResponse.objects.create(
-            attempt=attempt,
-            question=question
-        )
-
-        response.selected_answers.set(answers)
+    with transaction.atomic():
+        save_responses(attempt, selections, answer_key)
 
-    # Mark attempt completed
-    attempt.completed_at = timezone.now()
-    attempt.calculate_score()
+        # Mark attempt completed
+        attempt.completed_at = timezone.now()
+        attempt.calculate_score(selections=selections)
 
     messages.success(request, "Quiz submitted successfully.")
     return redirect("quiz_result", attempt.id)
@@ -1795,9 +1750,13 @@ def quiz_submit(request, attempt_id):
 @login_required
 def quiz_result(request, attempt_id):
     """Display quiz results"""
-    attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    attempt = get_object_or_404(
+        QuizAttempt.objects.select_related('quiz__course'),
+        id=attempt_id,
+        user=request.user
+    )
     
-    responses = attempt.responses.prefetch_related(
+    responses = attempt.responses.select_related('question').prefetch_related(
         'question__answers',
         'selected_answers'
     ).all()
@@ -1809,8 +1768,10 @@ def quiz_result(request, attempt_id):
     
     for response in responses:
         question = response.question
-        correct_answers = question.answers.filter(is_correct=True)
+        # Filter the prefetched answers in Python
+        correct_answers = [answer for answer in question.answers.all() if answer.is_correct]
         selected_answers = response.selected_answers.all()
+        # Stored at submit time, no re-grading
         is_correct = response.is_correct()
         
         # Count correct/incorrect answers
@@ -1875,15 +1836,19 @@ from .models import Video, CourseProgress, Certificate
 
 @login_required
 @require_POST
-def mark_video_complete(request, video_id):
+async def mark_video_complete(request, video_id):
     """Mark a video as completed and update progress"""
+    user = await request.auser()
     try:
-        video = get_object_or_404(Video, id=video_id)
+        video = await aget_object_or_404(
+            Video.objects.select_related('curriculum_day__course'),
+            id=video_id
+        )
         course = video.curriculum_day.course
         
         # Get or create UserVideoProgress
-        progress, created = UserVideoProgress.objects.get_or_create(
-            user=request.user,
+        progress, created = await UserVideoProgress.objects.aget_or_create(
+            user=user,
             video=video,
             defaults={
                 'is_completed': False,
@@ -1899,56 +1864,41 @@ def mark_video_complete(request, video_id):
         except:
             watched_percentage = 100
         
+        # Fold in any heartbeat still waiting in the write-behind buffer
+        pending = progress_buffer.pop(user.id, video.id)
+        if pending:
+            progress.watched_duration = max(progress.watched_duration, pending.watched_duration)
+        
         # Update video progress
         progress.is_completed = True
         progress.watched_percentage = watched_percentage
-        progress.save()
+        await progress.asave()
         
         # Get or create CourseProgress (for quiz tracking)
-        course_progress, created = CourseProgress.objects.get_or_create(
-            user=request.user,
+        course_progress, created = await CourseProgress.objects.aget_or_create(
+            user=user,
             course=course
         )
         
-        # Add video to completed videos
-        if video not in course_progress.completed_videos.all():
-            course_progress.completed_videos.add(video)
-        
-        # Update course progress
-        course_progress.update_progress()
-        
-        # Check if all videos are completed
-        all_videos = Video.objects.filter(curriculum_day__course=course)
-        total_videos = all_videos.count()
-        completed_videos = UserVideoProgress.objects.filter(
-            user=request.user,
-            video__in=all_videos,
-            is_completed=True
-        ).count()
+        # Add the video, bump the counters in place and check if the course
+        # is fully completed (videos + quiz). The video total is read from
+        # the cache, which may be database backed, so keep it off the loop.
+        def record_completion():
+            course_progress.record_completed_video(video)
+            return course_progress.all_videos_completed, course_progress.check_completion()
         
-        all_videos_completed = (completed_videos == total_videos)
-        
-        # Check if course is fully completed (videos + quiz)
-        course_completed = course_progress.check_completion()
+        all_videos_completed, course_completed = await sync_to_async(record_completion)()
         
         # Get certificate if generated
         certificate = None
         if course_completed:
-            try:
-                from .models import Certificate
-                certificate = Certificate.objects.get(
-                    user=request.user,
-                    course=course
-                )
-            except Certificate.DoesNotExist:
-                certificate = None
+            certificate = await Certificate.objects.filter(
+                user=user,
+                course=course
+            ).afirst()
         
         # Check if course has quiz
-        has_quiz = False
-        try:
-            has_quiz = hasattr(course, 'quiz') and course.quiz is not None
-        except:
-            has_quiz = False
+        has_quiz = await Quiz.objects.filter(course=course).aexists()
         
         return JsonResponse({
             'success': True,
@@ -1996,11 +1946,6 @@ def my_achievements(request):
     
     purchased_courses = Course.objects.filter(
         id__in=purchased_course_ids
-    ).prefetch_related(
-        Prefetch(
-            'curriculum_days__videos',
-            queryset=Video.objects.only('id')
-        )
     ).only('id', 'title', 'slug', 'thumbnail')
     
     # 3. Get course progress efficiently
@@ -2029,13 +1974,13 @@ def my_achievements(request):
     
     # Create a dictionary for quick lookup
     progress_dict = {p.course_id: p for p in progress_queryset}
+    certified_course_ids = set(certificates.values_list('course_id', flat=True))
     
-    for course in purchased_courses:
+    for course in purchased_courses.annotate(video_total=Count('curriculum_days__videos')):
         progress = progress_dict.get(course.id)
         
         if progress:
-            # Get total videos count from prefetched data
-            total_videos = sum(day.videos.count() for day in course.curriculum_days.all())
+            total_videos = course.video_total
             
             # Calculate actual percentage
             if total_videos > 0:
@@ -2051,7 +1996,7 @@ def my_achievements(request):
                 'quiz_passed': progress.quiz_passed,
                 'completed_videos_count': progress.completed_videos_count,
                 'total_videos': total_videos,
-                'has_certificate': certificates.filter(course=course).exists(),
+                'has_certificate': course.id in certified_course_ids,
             })
     
     # 6. Sort progress
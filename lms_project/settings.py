@@ -71,8 +71,10 @@ SITE_ID = 1
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'lms.middleware.AsyncWhiteNoiseMiddleware',
+    'lms.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'lms.middleware.SessionRefreshMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -103,20 +105,42 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'lms_project.wsgi.application'
+ASGI_APPLICATION = 'lms_project.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Production uses psycopg 3's connection pool: each worker keeps a few open
+# TLS connections and health-checks them before handing one out, instead
+# of reconnecting after every idle timeout. Django requires CONN_MAX_AGE=0
+# with a pool. Set DB_POOL=False to go back to persistent connections
+# (only under WSGI: ASGI requests never reuse a persistent connection).
+DB_POOL = os.getenv("DB_POOL", "True") == "True"
+
 if os.getenv("DATABASE_URL"):
     # Production (Render – PostgreSQL)
     DATABASES = {
         "default": dj_database_url.config(
             default=os.getenv("DATABASE_URL"),
-            conn_max_age=600,
+            conn_max_age=0 if DB_POOL else 600,
             ssl_require=True,
         )
     }
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+            # Seconds to wait for a free connection before erroring
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            # Close connections idle this long, and recycle old ones
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            # Ping each connection before handing it out
+            "check": ConnectionPool.check_connection,
+        }
 else:
     # Local development (SQLite)
     DATABASES = {
@@ -126,6 +150,61 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Production uses the database cache so every gunicorn worker sees the same
+# entries (run `python manage.py createcachetable` once); local development
+# keeps everything in process memory.
+
+if os.getenv("DATABASE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "lms_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "lms-local",
+        }
+    }
+
+# Cached curriculum trees are keyed by Course.curriculum_version, so they
+# only need a long expiry to let old versions fall out of the cache.
+CURRICULUM_TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Quiz answer keys are dropped by signals whenever a Question/Answer changes
+QUIZ_ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Home page snapshot (lms/home.py): served as fresh for this long after a
+# rebuild, then rebuilt by one request while the others get the stale copy.
+# Admin edits mark it stale right away.
+HOME_SNAPSHOT_FRESH_SECONDS = int(os.getenv("HOME_SNAPSHOT_FRESH_SECONDS", "300"))
+
+# Video progress heartbeats are buffered per worker and written in bulk
+# (see lms/progress.py)
+PROGRESS_BUFFER_MAX_SIZE = int(os.getenv("PROGRESS_BUFFER_MAX_SIZE", "200"))
+PROGRESS_BUFFER_FLUSH_SECONDS = float(os.getenv("PROGRESS_BUFFER_FLUSH_SECONDS", "5"))
+
+# Per-view query budgets (lms/middleware.py), keyed by URL name: requests
+# running more queries are logged, and lms/tests.py asserts the same limits.
+QUERY_BUDGETS = {
+    "home": 12,
+    "all_courses": 8,
+    "course_detail": 12,
+    "video_player": 15,
+    "my_courses": 15,
+    "my_achievements": 20,
+    "quiz_submit": 19,  # a pass that completes the course also issues the certificate
+    "quiz_result": 12,
+}
+
+# Send query count / DB time as a Server-Timing header (shows up in the
+# browser's network panel). Off in production unless asked for.
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", str(DEBUG)) == "True"
+
 # Custom User Model
 AUTH_USER_MODEL = 'lms.User'
 
@@ -226,6 +305,16 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
+# Point at `manage.py razorpay_stub` to load-test checkout offline
+RAZORPAY_BASE_URL = os.getenv("RAZORPAY_BASE_URL", "https://api.razorpay.com")
+RAZORPAY_CONNECT_TIMEOUT = float(os.getenv("RAZORPAY_CONNECT_TIMEOUT", "3"))
+RAZORPAY_READ_TIMEOUT = float(os.getenv("RAZORPAY_READ_TIMEOUT", "10"))
+RAZORPAY_MAX_RETRIES = int(os.getenv("RAZORPAY_MAX_RETRIES", "2"))
+RAZORPAY_RETRY_BACKOFF = float(os.getenv("RAZORPAY_RETRY_BACKOFF", "0.2"))
+RAZORPAY_POOL_SIZE = int(os.getenv("RAZORPAY_POOL_SIZE", "10"))
+# Fail fast for RAZORPAY_BREAKER_RESET_SECONDS after this many failed calls in a row
+RAZORPAY_BREAKER_THRESHOLD = int(os.getenv("RAZORPAY_BREAKER_THRESHOLD", "5"))
+RAZORPAY_BREAKER_RESET_SECONDS = float(os.getenv("RAZORPAY_BREAKER_RESET_SECONDS", "30"))
 
 # ===== GOOGLE OAUTH =====
 SOCIALACCOUNT_PROVIDERS = {
@@ -240,7 +329,8 @@ SOCIALACCOUNT_PROVIDERS = {
 }
 
 # Messages framework
-MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
+# Flash messages ride in a signed cookie so they never force a session write
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 
 
 
@@ -248,8 +338,13 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Session settings
+# Sessions are read from the cache and only written when they change.
+# SessionRefreshMiddleware keeps expiry sliding by re-saving a session once
+# it is more than SESSION_REFRESH_FRACTION of SESSION_COOKIE_AGE old.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db")
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_FRACTION = float(os.getenv("SESSION_REFRESH_FRACTION", "0.1"))
 
 # Security settings for production
 if not DEBUG: